@@ -2,20 +2,23 @@
 Admin API Service - Gestión centralizada de configuraciones administrativas
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.security import HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Deque, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import asyncio
 import httpx
-import json
+import orjson
 import os
+import time
+from collections import defaultdict, deque
 from enum import Enum
-import aiofiles
+from functools import lru_cache
 from pathlib import Path
-from fastapi import Request
+from types import MappingProxyType
 
 # Modelos de datos
 class APIType(str, Enum):
@@ -28,7 +31,46 @@ class APIStatus(str, Enum):
     inactive = "inactive"  
     error = "error"
 
+# Alias locales: los miembros de Enum son singletons, se comparan por identidad
+_AI = APIType.ai
+_ACTIVE = APIStatus.active
+_ERROR = APIStatus.error
+
+# Segundos durante los que se reutiliza el resultado de un probe de conexión
+_PROBE_CACHE_TTL = 30.0
+
+# Segundos máximos para un probe completo, incluido el timeout interno de httpx
+_PROBE_TIMEOUT = 12.0
+
+# Número máximo de health checks conservados en memoria y en disco
+_HEALTH_HISTORY_LIMIT = 1000
+
+# Número máximo de health checks indexados por API
+_HEALTH_HISTORY_PER_API = 100
+
+# Probes simultáneos máximos en un health check global
+_HEALTH_CHECK_CONCURRENCY = 20
+
+# Segundos de espera para agrupar escrituras a disco
+_SAVE_DEBOUNCE = 0.25
+
+# Registros a partir de los cuales la serialización se hace fuera del event loop
+_SERIALIZE_OFFLOAD_THRESHOLD = 50
+
+def _to_epoch_ms(value: datetime) -> int:
+    """Serializar un datetime como milisegundos desde epoch (formato en disco)"""
+    return int(value.timestamp() * 1000)
+
+def _from_epoch_ms(value: Any) -> Any:
+    """Aceptar milisegundos desde epoch; los ISO 8601 de archivos antiguos los resuelve pydantic"""
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value / 1000)
+    return value
+
 class APIConfig(BaseModel):
+    # Las rutas asignan campos ya validados por APIConfigUpdate: sin revalidar en cada asignación
+    model_config = ConfigDict(defer_build=True, validate_assignment=False)
+
     id: str
     name: str
     type: APIType
@@ -39,12 +81,21 @@ class APIConfig(BaseModel):
     last_check: datetime
     config_data: Dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("last_check", mode="before")
+    @classmethod
+    def _parse_last_check(cls, value: Any) -> Any:
+        return _from_epoch_ms(value)
+
 class APIConfigUpdate(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     endpoint: Optional[str] = None
     api_key: Optional[str] = None
     config_data: Dict[str, Any] = Field(default_factory=dict)
 
 class APIConfigCreate(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     name: str
     type: APIType
     endpoint: Optional[str] = None
@@ -53,18 +104,280 @@ class APIConfigCreate(BaseModel):
     config_data: Dict[str, Any] = Field(default_factory=dict)
 
 class HealthCheckResult(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     api_id: str
     status: APIStatus
     latency_ms: Optional[int] = None
     error_message: Optional[str] = None
     timestamp: datetime
 
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def _parse_timestamp(cls, value: Any) -> Any:
+        return _from_epoch_ms(value)
+
+def _dump_health_history(history: List[HealthCheckResult]) -> bytes:
+    """Serializar el historial de health checks con fechas en milisegundos desde epoch"""
+    health_data = []
+    for health_result in history:
+        item = health_result.model_dump()
+        item["timestamp"] = _to_epoch_ms(health_result.timestamp)
+        health_data.append(item)
+    return orjson.dumps(health_data)
+
+async def _serialize(size: int, dump, data) -> bytes:
+    """Serializar en un hilo solo si el volumen compensa el salto al threadpool"""
+    if size > _SERIALIZE_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(dump, data)
+    return dump(data)
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Escribir en un temporal y reemplazar: el archivo nunca queda truncado"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    """Validador de listas para la carga en bloque (se construye al primer uso)"""
+    return TypeAdapter(List[model])
+
+# Configuraciones predeterminadas (se crean si no hay archivo persistido).
+# Construidas una vez sin validación; last_check se asigna al copiarlas.
+_DEFAULT_CONFIGS = (
+    APIConfig.model_construct(
+        id="openai",
+        name="OpenAI",
+        type=_AI,
+        status=APIStatus.inactive,
+        description="Integración con GPT-4 y otros modelos OpenAI",
+        endpoint="https://api.openai.com/v1",
+        api_key=None,
+        config_data={
+            "model": "gpt-4",
+            "temperature": 0.7,
+            "max_tokens": 4000
+        }
+    ),
+    APIConfig.model_construct(
+        id="claude",
+        name="Anthropic Claude",
+        type=_AI,
+        status=APIStatus.inactive,
+        description="Integración con Claude para análisis avanzados",
+        endpoint="https://api.anthropic.com/v1",
+        api_key=None,
+        config_data={
+            "model": "claude-3-sonnet-20240229",
+            "max_tokens": 4000
+        }
+    ),
+)
+
+# APIs predeterminadas que no se pueden eliminar
+_PROTECTED_DEFAULTS = frozenset(config.id for config in _DEFAULT_CONFIGS)
+
+# Usuario de demo compartido por todas las requests (solo lectura)
+_DEMO_USER = MappingProxyType({"tenant_id": "tause.pro"})
+
+# Payloads del dashboard: datos estáticos, se construyen una vez al importar
+_DASHBOARD_STATS = {
+    "total_tenants": 1,
+    "active_tenants": 1,
+    "total_requests": 1247,
+    "success_rate": 99.2,
+    "avg_response_time": 125,
+    "monthly_revenue": 2850.00,
+    "total_endpoints": 18,
+    "healthy_services": 5,
+    "total_services": 8,
+    "api_calls_today": 247,
+    "error_rate": 0.8,
+    "uptime": 99.9,
+    "storage_usage_gb": 2.3,
+    "active_users": 12
+}
+
+# Métricas de servicios
+_SERVICE_METRICS = [
+    {
+        "name": "API Gateway",
+        "status": "healthy",
+        "response_time": 95,
+        "requests_per_minute": 45,
+        "error_rate": 0.2
+    },
+    {
+        "name": "Admin API",
+        "status": "healthy",
+        "response_time": 120,
+        "requests_per_minute": 12,
+        "error_rate": 0.1
+    },
+    {
+        "name": "AI Services",
+        "status": "healthy",
+        "response_time": 230,
+        "requests_per_minute": 8,
+        "error_rate": 0.3
+    },
+    {
+        "name": "Analytics",
+        "status": "healthy",
+        "response_time": 180,
+        "requests_per_minute": 15,
+        "error_rate": 0.0
+    },
+    {
+        "name": "Communications",
+        "status": "healthy",
+        "response_time": 150,
+        "requests_per_minute": 6,
+        "error_rate": 0.1
+    }
+]
+
+# Métricas de tenants
+_TENANT_METRICS = [
+    {
+        "tenant_id": "tause.pro",
+        "requests_today": 247,
+        "active_endpoints": 12,
+        "storage_usage_gb": 2.3,
+        "monthly_usage": 8450
+    }
+]
+
+_DASHBOARD_METRICS = {
+    "service_metrics": _SERVICE_METRICS,
+    "tenant_metrics": _TENANT_METRICS,
+    "system_health": {
+        "cpu_usage": 45.2,
+        "memory_usage": 67.8,
+        "disk_usage": 34.1,
+        "network_io": 1.2
+    }
+}
+
+_TOP_ENDPOINTS = {
+    "top_endpoints": [
+        {
+            "endpoint": "/api/ai/generate",
+            "requests": 1247,
+            "avg_response_time": 340,
+            "error_rate": 0.3
+        },
+        {
+            "endpoint": "/api/analytics/events",
+            "requests": 890,
+            "avg_response_time": 120,
+            "error_rate": 0.1
+        },
+        {
+            "endpoint": "/api/billing/usage",
+            "requests": 567,
+            "avg_response_time": 90,
+            "error_rate": 0.0
+        },
+        {
+            "endpoint": "/api/communications/send",
+            "requests": 234,
+            "avg_response_time": 180,
+            "error_rate": 0.2
+        },
+        {
+            "endpoint": "/api/templates/render",
+            "requests": 123,
+            "avg_response_time": 250,
+            "error_rate": 0.1
+        }
+    ]
+}
+
+_TOP_TENANTS = {
+    "top_tenants": [
+        {
+            "tenant_id": "tause.pro",
+            "total_requests": 3847,
+            "active_endpoints": 12,
+            "monthly_revenue": 2850.00,
+            "storage_usage_gb": 2.3,
+            "last_activity": "2024-01-07T15:30:00"
+        }
+    ]
+}
+
+_RECENT_ACTIVITY = {
+    "recent_activity": [
+        {
+            "timestamp": "2024-01-07T15:45:00",
+            "type": "api_request",
+            "tenant_id": "tause.pro",
+            "endpoint": "/api/ai/generate",
+            "status": "success",
+            "response_time": 340
+        },
+        {
+            "timestamp": "2024-01-07T15:42:00",
+            "type": "api_request",
+            "tenant_id": "tause.pro",
+            "endpoint": "/api/analytics/events",
+            "status": "success",
+            "response_time": 120
+        },
+        {
+            "timestamp": "2024-01-07T15:40:00",
+            "type": "health_check",
+            "service": "ai_services",
+            "status": "healthy",
+            "response_time": 95
+        },
+        {
+            "timestamp": "2024-01-07T15:38:00",
+            "type": "api_request",
+            "tenant_id": "tause.pro",
+            "endpoint": "/api/billing/usage",
+            "status": "success",
+            "response_time": 90
+        },
+        {
+            "timestamp": "2024-01-07T15:35:00",
+            "type": "error",
+            "tenant_id": "tause.pro",
+            "endpoint": "/api/communications/send",
+            "status": "error",
+            "error_message": "Rate limit exceeded"
+        }
+    ]
+}
+
+# Respuestas del dashboard serializadas una sola vez
+_DASHBOARD_STATS_JSON = orjson.dumps(_DASHBOARD_STATS)
+_DASHBOARD_METRICS_JSON = orjson.dumps(_DASHBOARD_METRICS)
+_TOP_ENDPOINTS_JSON = orjson.dumps(_TOP_ENDPOINTS)
+_TOP_TENANTS_JSON = orjson.dumps(_TOP_TENANTS)
+_RECENT_ACTIVITY_JSON = orjson.dumps(_RECENT_ACTIVITY)
+
 class AdminAPIService:
     def __init__(self):
-        self.app = FastAPI(title="TauseStack Admin API", version="1.0.0")
+        self.app = FastAPI(
+            title="TauseStack Admin API",
+            version="1.0.0",
+            default_response_class=ORJSONResponse
+        )
         self.security = HTTPBearer()
         self.api_configs: Dict[str, APIConfig] = {}
-        self.health_history: List[HealthCheckResult] = []
+        # Copia serializable de cada configuración, actualizada solo al mutarla
+        self._api_configs_json: Dict[str, Dict[str, Any]] = {}
+        # Historial acotado: los registros más antiguos se descartan al agregar
+        self.health_history: Deque[HealthCheckResult] = deque(maxlen=_HEALTH_HISTORY_LIMIT)
+        # Índice por api_id para consultar el historial sin recorrer otras APIs
+        self._history_by_api: Dict[str, Deque[HealthCheckResult]] = defaultdict(
+            lambda: deque(maxlen=_HEALTH_HISTORY_PER_API)
+        )
+        # api_id -> (hash de la API key, instante monotónico del probe, resultado)
+        self._probe_cache: Dict[str, Tuple[int, float, HealthCheckResult]] = {}
         
         # Configurar CORS
         self.app.add_middleware(
@@ -81,36 +394,84 @@ class AdminAPIService:
         self.apis_file = self.data_dir / "api_configs.json"
         self.health_file = self.data_dir / "health_history.json"
         
+        # Cliente HTTP compartido (pool de conexiones), se crea en startup o en el primer probe
+        self.http_client: Optional[httpx.AsyncClient] = None
+        
+        # Escritura diferida: sin startup (p. ej. uso directo) se escribe en el acto
+        self._save_queue: Optional[asyncio.Queue] = None
+        self._saver_task: Optional[asyncio.Task] = None
+        
         # Configurar eventos de FastAPI
+        self.app.add_event_handler("startup", self._startup)
         self.app.add_event_handler("startup", self._load_configurations)
+        self.app.add_event_handler("shutdown", self._shutdown)
         
         # Configurar rutas
         self._setup_routes()
     
+    async def _startup(self):
+        """Crear el cliente HTTP compartido y la tarea de guardado diferido"""
+        self._ensure_client()
+        self._save_queue = asyncio.Queue()
+        self._saver_task = asyncio.create_task(self._saver_loop())
+    
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartido; sin startup (p. ej. uso directo) se crea al primer uso"""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=60)
+            )
+        return self.http_client
+    
+    async def _shutdown(self):
+        """Volcar escrituras pendientes y cerrar el cliente HTTP compartido"""
+        if self._saver_task is not None:
+            self._saver_task.cancel()
+            await asyncio.gather(self._saver_task, return_exceptions=True)
+            self._saver_task = None
+            
+            # Escritura final incondicional: cubre una escritura interrumpida por la cancelación
+            await self._write_apis()
+            await self._write_health_history()
+        self._save_queue = None
+        
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+    
+    async def _read_json(self, path: Path) -> Optional[Any]:
+        """Leer y parsear un archivo JSON fuera del event loop; None si no existe"""
+        if not path.exists():
+            return None
+        content = await asyncio.to_thread(path.read_bytes)
+        return await asyncio.to_thread(orjson.loads, content)
+    
     async def _load_configurations(self):
         """Cargar configuraciones desde archivo JSON"""
         try:
+            # Leer ambos archivos en paralelo
+            apis_data, health_data = await asyncio.gather(
+                self._read_json(self.apis_file),
+                self._read_json(self.health_file)
+            )
+            
             # Cargar APIs
-            if self.apis_file.exists():
-                async with aiofiles.open(self.apis_file, 'r') as f:
-                    content = await f.read()
-                    apis_data = json.loads(content)
-                    for api_data in apis_data:
-                        api_data['last_check'] = datetime.fromisoformat(api_data['last_check'])
-                        api_config = APIConfig(**api_data)
-                        self.api_configs[api_config.id] = api_config
+            if apis_data is not None:
+                # Validación en bloque; el dict se construye de una sola pasada
+                configs = _list_adapter(APIConfig).validate_python(apis_data)
+                self.api_configs = {api_config.id: api_config for api_config in configs}
+                self._api_configs_json = {}
+                for api_config in configs:
+                    self._sync_api_json(api_config)
             else:
                 # Cargar configuraciones por defecto
                 await self._load_default_configs()
             
             # Cargar historial de health checks
-            if self.health_file.exists():
-                async with aiofiles.open(self.health_file, 'r') as f:
-                    content = await f.read()
-                    health_data = json.loads(content)
-                    for health_item in health_data:
-                        health_item['timestamp'] = datetime.fromisoformat(health_item['timestamp'])
-                        self.health_history.append(HealthCheckResult(**health_item))
+            if health_data is not None:
+                for health_result in _list_adapter(HealthCheckResult).validate_python(health_data):
+                    self._record_health(health_result)
                         
         except Exception as e:
             print(f"Error loading configurations: {e}")
@@ -118,71 +479,71 @@ class AdminAPIService:
     
     async def _load_default_configs(self):
         """Cargar configuraciones predeterminadas"""
-        default_configs = [
-            {
-                "id": "openai",
-                "name": "OpenAI",
-                "type": "ai",
-                "status": "inactive",
-                "description": "Integración con GPT-4 y otros modelos OpenAI",
-                "endpoint": "https://api.openai.com/v1",
-                "last_check": datetime.now(),
-                "config_data": {
-                    "model": "gpt-4",
-                    "temperature": 0.7,
-                    "max_tokens": 4000
-                }
-            },
-            {
-                "id": "claude",
-                "name": "Anthropic Claude",
-                "type": "ai",
-                "status": "inactive",
-                "description": "Integración con Claude para análisis avanzados",
-                "endpoint": "https://api.anthropic.com/v1",
-                "last_check": datetime.now(),
-                "config_data": {
-                    "model": "claude-3-sonnet-20240229",
-                    "max_tokens": 4000
-                }
-            }
-        ]
+        now = datetime.now()
         
-        for config in default_configs:
-            api_config = APIConfig(**config)
-            self.api_configs[config["id"]] = api_config
+        for config in _DEFAULT_CONFIGS:
+            # Copia profunda: config_data no se comparte con la plantilla
+            api_config = config.model_copy(update={"last_check": now}, deep=True)
+            self.api_configs[api_config.id] = api_config
+            self._sync_api_json(api_config)
         
         # Guardar configuraciones por defecto
         await self._save_apis()
     
+    def _sync_api_json(self, api_config: APIConfig):
+        """Actualizar la copia serializable de una configuración tras modificarla"""
+        data = api_config.model_dump()
+        data["last_check"] = _to_epoch_ms(api_config.last_check)
+        self._api_configs_json[api_config.id] = data
+    
+    def _record_health(self, health_result: HealthCheckResult):
+        """Registrar un health check en el historial global y en el índice por API"""
+        self.health_history.append(health_result)
+        self._history_by_api[health_result.api_id].append(health_result)
+    
     async def _save_apis(self):
+        """Programar el guardado de configuraciones de APIs (escritura diferida)"""
+        if self._save_queue is None:
+            await self._write_apis()
+        else:
+            self._save_queue.put_nowait(self._write_apis)
+    
+    async def _save_health_history(self):
+        """Programar el guardado del historial de health checks (escritura diferida)"""
+        if self._save_queue is None:
+            await self._write_health_history()
+        else:
+            self._save_queue.put_nowait(self._write_health_history)
+    
+    async def _saver_loop(self):
+        """Consumir la cola de guardado: una ráfaga de cambios produce una escritura por archivo"""
+        while True:
+            writers = {await self._save_queue.get()}
+            await asyncio.sleep(_SAVE_DEBOUNCE)
+            while not self._save_queue.empty():
+                writers.add(self._save_queue.get_nowait())
+            for writer in writers:
+                await writer()
+    
+    async def _write_apis(self):
         """Guardar configuraciones de APIs en archivo JSON"""
         try:
-            apis_data = []
-            for api_config in self.api_configs.values():
-                api_dict = api_config.dict()
-                api_dict['last_check'] = api_dict['last_check'].isoformat()
-                apis_data.append(api_dict)
+            # Copias ya volcadas en cada mutación, con fechas en milisegundos desde epoch
+            apis_data = list(self._api_configs_json.values())
             
-            async with aiofiles.open(self.apis_file, 'w') as f:
-                await f.write(json.dumps(apis_data, indent=2))
+            payload = await _serialize(len(apis_data), orjson.dumps, apis_data)
+            await asyncio.to_thread(_atomic_write, self.apis_file, payload)
         except Exception as e:
             print(f"Error saving APIs: {e}")
     
-    async def _save_health_history(self):
+    async def _write_health_history(self):
         """Guardar historial de health checks"""
         try:
-            # Mantener solo los últimos 100 registros
-            recent_history = self.health_history[-100:]
-            
-            health_data = []
-            for health_result in recent_history:
-                health_dict = health_result.dict()
-                health_dict['timestamp'] = health_dict['timestamp'].isoformat()
-                health_data.append(health_dict)
+            # Instantánea en el loop: el deque no se puede recorrer desde otro hilo mientras cambia
+            history = list(self.health_history)
             
-            async with aiofiles.open(self.health_file, 'w') as f:
-                await f.write(json.dumps(health_data, indent=2))
+            payload = await _serialize(len(history), _dump_health_history, history)
+            await asyncio.to_thread(_atomic_write, self.health_file, payload)
         except Exception as e:
             print(f"Error saving health history: {e}")
     
@@ -218,24 +579,24 @@ class AdminAPIService:
         @self.app.middleware("http")
         async def demo_middleware(request: Request, call_next):
             # Agregar tenant_id automáticamente para demos
-            if hasattr(request.state, 'user') is False:
-                request.state.user = {"tenant_id": "tause.pro"}
+            if not hasattr(request.state, 'user'):
+                request.state.user = _DEMO_USER
             
             return await call_next(request)
         
-        @self.app.get("/admin/apis", response_model=List[APIConfig])
+        @self.app.get("/admin/apis")
         async def get_all_apis():
             """Obtener todas las configuraciones de APIs"""
-            return list(self.api_configs.values())
+            return [api_config.model_dump(mode="json") for api_config in self.api_configs.values()]
         
-        @self.app.get("/admin/apis/{api_id}", response_model=APIConfig)
+        @self.app.get("/admin/apis/{api_id}")
         async def get_api_config(api_id: str):
             """Obtener configuración específica de una API"""
             if api_id not in self.api_configs:
                 raise HTTPException(status_code=404, detail="API no encontrada")
-            return self.api_configs[api_id]
+            return self.api_configs[api_id].model_dump(mode="json")
         
-        @self.app.post("/admin/apis", response_model=APIConfig)
+        @self.app.post("/admin/apis")
         async def create_api_config(config_create: APIConfigCreate):
             """Crear nueva configuración de API"""
             # Generar ID único
@@ -260,11 +621,12 @@ class AdminAPIService:
             
             # Guardar
             self.api_configs[api_id] = api_config
+            self._sync_api_json(api_config)
             await self._save_apis()
             
-            return api_config
+            return api_config.model_dump(mode="json")
         
-        @self.app.put("/admin/apis/{api_id}", response_model=APIConfig)
+        @self.app.put("/admin/apis/{api_id}")
         async def update_api_config(api_id: str, config_update: APIConfigUpdate):
             """Actualizar configuración de una API"""
             if api_id not in self.api_configs:
@@ -280,10 +642,12 @@ class AdminAPIService:
             if config_update.config_data:
                 api_config.config_data.update(config_update.config_data)
             
-            # Guardar configuración
+            # Guardar configuración; el probe cacheado ya no refleja la nueva configuración
+            self._probe_cache.pop(api_id, None)
+            self._sync_api_json(api_config)
             await self._save_apis()
             
-            return api_config
+            return api_config.model_dump(mode="json")
         
         @self.app.delete("/admin/apis/{api_id}")
         async def delete_api_config(api_id: str):
@@ -292,42 +656,60 @@ class AdminAPIService:
                 raise HTTPException(status_code=404, detail="API no encontrada")
             
             # No permitir eliminar APIs por defecto
-            if api_id in ["openai", "claude"]:
+            if api_id in _PROTECTED_DEFAULTS:
                 raise HTTPException(status_code=400, detail="No se puede eliminar API por defecto")
             
             del self.api_configs[api_id]
+            self._api_configs_json.pop(api_id, None)
+            self._probe_cache.pop(api_id, None)
             await self._save_apis()
             
             return {"message": f"API {api_id} eliminada exitosamente"}
         
-        @self.app.post("/admin/apis/{api_id}/test", response_model=HealthCheckResult)
+        @self.app.post("/admin/apis/{api_id}/test")
         async def test_api_connection(api_id: str):
             """Probar conexión a una API específica"""
             if api_id not in self.api_configs:
                 raise HTTPException(status_code=404, detail="API no encontrada")
             
             result = await self._test_connection(api_id)
-            return result
+            return result.model_dump(mode="json")
         
-        @self.app.get("/admin/apis/{api_id}/health", response_model=List[HealthCheckResult])
+        @self.app.get("/admin/apis/{api_id}/health")
         async def get_health_history(api_id: str, limit: int = 10):
             """Obtener historial de health checks para una API"""
-            history = [h for h in self.health_history if h.api_id == api_id]
-            return history[-limit:]
+            history = list(self._history_by_api.get(api_id, ()))
+            return [h.model_dump(mode="json") for h in history[-limit:]]
         
         @self.app.post("/admin/health-check-all")
         async def run_health_check_all():
             """Ejecutar health check para todas las APIs"""
-            results = []
-            for api_id in self.api_configs:
-                result = await self._test_connection(api_id)
-                results.append(result)
+            api_ids = list(self.api_configs)
+            semaphore = asyncio.Semaphore(_HEALTH_CHECK_CONCURRENCY)
+            
+            async def check(api_id: str) -> HealthCheckResult:
+                async with semaphore:
+                    return await self._test_connection(api_id)
+            
+            # Probes concurrentes: la latencia total es la del más lento, no la suma
+            outcomes = await asyncio.gather(*(check(api_id) for api_id in api_ids), return_exceptions=True)
+            results = [
+                outcome if isinstance(outcome, HealthCheckResult) else HealthCheckResult(
+                    api_id=api_id,
+                    status=_ERROR,
+                    error_message=str(outcome),
+                    timestamp=datetime.now()
+                )
+                for api_id, outcome in zip(api_ids, outcomes)
+            ]
             
             # Actualizar estados
             for result in results:
-                if result.api_id in self.api_configs:
-                    self.api_configs[result.api_id].status = result.status
-                    self.api_configs[result.api_id].last_check = result.timestamp
+                api_config = self.api_configs.get(result.api_id)
+                if api_config is not None:
+                    api_config.status = result.status
+                    api_config.last_check = result.timestamp
+                    self._sync_api_json(api_config)
             
             await self._save_apis()
             await self._save_health_history()
@@ -337,188 +719,27 @@ class AdminAPIService:
         @self.app.get("/admin/dashboard/stats")
         async def get_dashboard_stats():
             """Obtener estadísticas del dashboard"""
-            return {
-                "total_tenants": 1,
-                "active_tenants": 1,
-                "total_requests": 1247,
-                "success_rate": 99.2,
-                "avg_response_time": 125,
-                "monthly_revenue": 2850.00,
-                "total_endpoints": 18,
-                "healthy_services": 5,
-                "total_services": 8,
-                "api_calls_today": 247,
-                "error_rate": 0.8,
-                "uptime": 99.9,
-                "storage_usage_gb": 2.3,
-                "active_users": 12
-            }
+            return Response(content=_DASHBOARD_STATS_JSON, media_type="application/json")
         
         @self.app.get("/admin/dashboard/metrics")
         async def get_dashboard_metrics():
             """Obtener métricas detalladas del dashboard"""
-            
-            # Métricas de servicios
-            service_metrics = [
-                {
-                    "name": "API Gateway",
-                    "status": "healthy",
-                    "response_time": 95,
-                    "requests_per_minute": 45,
-                    "error_rate": 0.2
-                },
-                {
-                    "name": "Admin API",
-                    "status": "healthy",
-                    "response_time": 120,
-                    "requests_per_minute": 12,
-                    "error_rate": 0.1
-                },
-                {
-                    "name": "AI Services",
-                    "status": "healthy",
-                    "response_time": 230,
-                    "requests_per_minute": 8,
-                    "error_rate": 0.3
-                },
-                {
-                    "name": "Analytics",
-                    "status": "healthy",
-                    "response_time": 180,
-                    "requests_per_minute": 15,
-                    "error_rate": 0.0
-                },
-                {
-                    "name": "Communications",
-                    "status": "healthy",
-                    "response_time": 150,
-                    "requests_per_minute": 6,
-                    "error_rate": 0.1
-                }
-            ]
-            
-            # Métricas de tenants
-            tenant_metrics = [
-                {
-                    "tenant_id": "tause.pro",
-                    "requests_today": 247,
-                    "active_endpoints": 12,
-                    "storage_usage_gb": 2.3,
-                    "monthly_usage": 8450
-                }
-            ]
-            
-            return {
-                "service_metrics": service_metrics,
-                "tenant_metrics": tenant_metrics,
-                "system_health": {
-                    "cpu_usage": 45.2,
-                    "memory_usage": 67.8,
-                    "disk_usage": 34.1,
-                    "network_io": 1.2
-                }
-            }
+            return Response(content=_DASHBOARD_METRICS_JSON, media_type="application/json")
         
         @self.app.get("/admin/dashboard/top-endpoints")
         async def get_top_endpoints():
             """Obtener endpoints más utilizados"""
-            endpoints = [
-                {
-                    "endpoint": "/api/ai/generate",
-                    "requests": 1247,
-                    "avg_response_time": 340,
-                    "error_rate": 0.3
-                },
-                {
-                    "endpoint": "/api/analytics/events",
-                    "requests": 890,
-                    "avg_response_time": 120,
-                    "error_rate": 0.1
-                },
-                {
-                    "endpoint": "/api/billing/usage",
-                    "requests": 567,
-                    "avg_response_time": 90,
-                    "error_rate": 0.0
-                },
-                {
-                    "endpoint": "/api/communications/send",
-                    "requests": 234,
-                    "avg_response_time": 180,
-                    "error_rate": 0.2
-                },
-                {
-                    "endpoint": "/api/templates/render",
-                    "requests": 123,
-                    "avg_response_time": 250,
-                    "error_rate": 0.1
-                }
-            ]
-            
-            return {"top_endpoints": endpoints}
+            return Response(content=_TOP_ENDPOINTS_JSON, media_type="application/json")
         
         @self.app.get("/admin/dashboard/top-tenants")
         async def get_top_tenants():
             """Obtener tenants más activos"""
-            tenants = [
-                {
-                    "tenant_id": "tause.pro",
-                    "total_requests": 3847,
-                    "active_endpoints": 12,
-                    "monthly_revenue": 2850.00,
-                    "storage_usage_gb": 2.3,
-                    "last_activity": "2024-01-07T15:30:00"
-                }
-            ]
-            
-            return {"top_tenants": tenants}
+            return Response(content=_TOP_TENANTS_JSON, media_type="application/json")
         
         @self.app.get("/admin/dashboard/recent-activity")
         async def get_recent_activity():
             """Obtener actividad reciente del sistema"""
-            activities = [
-                {
-                    "timestamp": "2024-01-07T15:45:00",
-                    "type": "api_request",
-                    "tenant_id": "tause.pro",
-                    "endpoint": "/api/ai/generate",
-                    "status": "success",
-                    "response_time": 340
-                },
-                {
-                    "timestamp": "2024-01-07T15:42:00",
-                    "type": "api_request",
-                    "tenant_id": "tause.pro",
-                    "endpoint": "/api/analytics/events",
-                    "status": "success",
-                    "response_time": 120
-                },
-                {
-                    "timestamp": "2024-01-07T15:40:00",
-                    "type": "health_check",
-                    "service": "ai_services",
-                    "status": "healthy",
-                    "response_time": 95
-                },
-                {
-                    "timestamp": "2024-01-07T15:38:00",
-                    "type": "api_request",
-                    "tenant_id": "tause.pro",
-                    "endpoint": "/api/billing/usage",
-                    "status": "success",
-                    "response_time": 90
-                },
-                {
-                    "timestamp": "2024-01-07T15:35:00",
-                    "type": "error",
-                    "tenant_id": "tause.pro",
-                    "endpoint": "/api/communications/send",
-                    "status": "error",
-                    "error_message": "Rate limit exceeded"
-                }
-            ]
-            
-            return {"recent_activity": activities}
+            return Response(content=_RECENT_ACTIVITY_JSON, media_type="application/json")
         
         @self.app.get("/health")
         async def health_check():
@@ -533,47 +754,56 @@ class AdminAPIService:
     async def _test_connection(self, api_id: str) -> HealthCheckResult:
         """Probar conexión con una API específica"""
         api_config = self.api_configs[api_id]
-        start_time = datetime.now()
+        
+        # Reutilizar probes recientes con la misma API key para no saturar al proveedor
+        # (se devuelve tal cual: su timestamp es el del check ya registrado en el historial)
+        key_hash = hash(api_config.api_key)
+        cached = self._probe_cache.get(api_id)
+        if cached is not None:
+            cached_key_hash, probed_at, cached_result = cached
+            if cached_key_hash == key_hash and time.monotonic() - probed_at < _PROBE_CACHE_TTL:
+                return cached_result
+        
+        ts = datetime.now()
+        start = time.perf_counter()
+        latency: Optional[int] = None
+        error: Optional[str] = None
         
         try:
-            if api_config.type == APIType.ai:
-                success = await self._test_ai_connection(api_config)
+            if api_config.type is _AI:
+                probe = self._test_ai_connection(api_config)
             else:
-                success = await self._test_generic_connection(api_config)
-            
-            # Calcular latencia
-            latency = int((datetime.now() - start_time).total_seconds() * 1000)
-            
-            # Actualizar estado
-            new_status = APIStatus.active if success else APIStatus.error
-            api_config.status = new_status
-            api_config.last_check = datetime.now()
-            
-            health_result = HealthCheckResult(
-                api_id=api_id,
-                status=new_status,
-                latency_ms=latency,
-                timestamp=datetime.now()
-            )
-            
-            self.health_history.append(health_result)
-            await self._save_apis()
-            return health_result
-            
+                probe = self._test_generic_connection(api_config)
+            # Límite duro por encima del timeout de httpx (DNS o TLS colgados)
+            success = await asyncio.wait_for(probe, timeout=_PROBE_TIMEOUT)
+            latency = int((time.perf_counter() - start) * 1000)
+            new_status = _ACTIVE if success else _ERROR
+        except asyncio.TimeoutError:
+            new_status = _ERROR
+            error = f"Timeout: sin respuesta en {_PROBE_TIMEOUT:.0f}s"
         except Exception as e:
-            api_config.status = APIStatus.error
-            api_config.last_check = datetime.now()
-            
-            health_result = HealthCheckResult(
-                api_id=api_id,
-                status=APIStatus.error,
-                error_message=str(e),
-                timestamp=datetime.now()
-            )
-            
-            self.health_history.append(health_result)
-            await self._save_apis()
-            return health_result
+            new_status = _ERROR
+            error = str(e)
+        
+        # Un único punto de actualización y persistencia
+        api_config.status = new_status
+        api_config.last_check = ts
+        self._sync_api_json(api_config)
+        
+        health_result = HealthCheckResult(
+            api_id=api_id,
+            status=new_status,
+            latency_ms=latency,
+            error_message=error,
+            timestamp=ts
+        )
+        
+        if error is None:
+            self._probe_cache[api_id] = (key_hash, time.monotonic(), health_result)
+        
+        self._record_health(health_result)
+        await self._save_apis()
+        return health_result
     
     async def _test_ai_connection(self, api_config: APIConfig) -> bool:
         """Probar conexión con APIs de IA"""
@@ -581,34 +811,30 @@ class AdminAPIService:
             return False
         
         try:
+            client = self._ensure_client()
             timeout = httpx.Timeout(10.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                if api_config.id == "openai":
-                    headers = {"Authorization": f"Bearer {api_config.api_key}"}
-                    test_url = f"{api_config.endpoint}/models"
-                    response = await client.get(test_url, headers=headers)
-                    return response.status_code == 200
-                
-                elif api_config.id == "claude":
-                    headers = {
-                        "x-api-key": api_config.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json"
-                    }
-                    test_url = f"{api_config.endpoint}/messages"
-                    test_payload = {
-                        "model": api_config.config_data.get("model", "claude-3-sonnet-20240229"),
-                        "max_tokens": 10,
-                        "messages": [{"role": "user", "content": "test"}]
-                    }
-                    response = await client.post(test_url, headers=headers, json=test_payload)
-                    return response.status_code < 400
-                
-                else:
-                    # Test genérico para otras APIs de IA
-                    headers = {"Authorization": f"Bearer {api_config.api_key}"}
-                    response = await client.get(api_config.endpoint, headers=headers)
-                    return response.status_code < 400
+            if api_config.id == "openai":
+                headers = {"Authorization": f"Bearer {api_config.api_key}"}
+                test_url = f"{api_config.endpoint}/models"
+                # HEAD valida la API key sin descargar el listado completo de modelos
+                response = await client.head(test_url, headers=headers, timeout=timeout)
+                return response.status_code == 200
+            
+            elif api_config.id == "claude":
+                headers = {
+                    "x-api-key": api_config.api_key,
+                    "anthropic-version": "2023-06-01"
+                }
+                test_url = f"{api_config.endpoint}/models"
+                # Listar modelos valida la API key sin generar (ni facturar) tokens
+                response = await client.get(test_url, headers=headers, timeout=timeout)
+                return response.status_code == 200
+            
+            else:
+                # Test genérico para otras APIs de IA
+                headers = {"Authorization": f"Bearer {api_config.api_key}"}
+                response = await client.get(api_config.endpoint, headers=headers, timeout=timeout)
+                return response.status_code < 400
                     
         except Exception as e:
             print(f"AI connection test failed for {api_config.id}: {e}")
@@ -620,10 +846,8 @@ class AdminAPIService:
             return False
         
         try:
-            timeout = httpx.Timeout(5.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(api_config.endpoint)
-                return response.status_code < 400
+            response = await self._ensure_client().get(api_config.endpoint, timeout=httpx.Timeout(5.0))
+            return response.status_code < 400
         except Exception as e:
             print(f"Generic connection test failed for {api_config.id}: {e}")
             return False
@@ -636,4 +860,5 @@ app = admin_service.app
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
+    # uvloop y httptools vienen con uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools") 
\ No newline at end of file
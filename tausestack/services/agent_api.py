@@ -7,32 +7,66 @@ Incluye CRUD de agentes, ejecución de tareas, y monitoreo.
 """
 
 import asyncio
-import json
+import logging
 import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Any, Type
 
 import aiofiles
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 # Importar componentes de Agent Engine
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-
 from tausestack.services.agent_engine.core.agent_role import AgentRole, AgentType, PresetRoles
 from tausestack.services.agent_engine.core.agent_config import AgentConfig
 from tausestack.services.agent_engine.core.agent_result import AgentResult
 from tausestack.services.agent_engine.core.tausestack_agent import TauseStackAgent, TauseStackAgentManager
 
+logger = logging.getLogger(__name__)
+
+
+# Directorio de almacenamiento de agentes configurados
+_STORAGE_DIR = Path(".tausestack_storage/agents")
+
+# Número máximo de tareas conservadas en el historial
+_TASK_HISTORY_LIMIT = 500
+
+# Líneas en disco a partir de las cuales el JSONL se reescribe desde memoria
+_TASK_HISTORY_ROTATE_AT = 2 * _TASK_HISTORY_LIMIT
+
+# Segundos de espera para agrupar escrituras del historial de tareas
+_HISTORY_FLUSH_DELAY = 1.0
+
+# Fábricas de roles preset por role_type
+_PRESET_ROLES: Dict[str, Callable[[], AgentRole]] = {
+    'research': PresetRoles.research_agent,
+    'writer': PresetRoles.writer_agent,
+    'customer_support': PresetRoles.customer_support_agent,
+    'ecommerce': PresetRoles.ecommerce_agent,
+}
+
 
 # ========================= MODELS =========================
 
-class AgentStatusModel(BaseModel):
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Convertir un timestamp ISO 8601 a datetime (las respuestas no pasan por validación)"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+# Las respuestas son dataclasses construidas desde estado interno confiable;
+# los requests siguen validándose con Pydantic.
+
+@dataclass
+class AgentStatusModel:
     agent_id: str
     name: str
     tenant_id: str
@@ -66,7 +100,29 @@ class TaskExecutionRequest(BaseModel):
     context: Dict[str, Any] = Field(default_factory=dict)
     priority: str = "normal"  # "low", "normal", "high"
 
-class TaskExecutionResponse(BaseModel):
+def _json_body(model: Type[BaseModel]) -> Callable:
+    """Dependencia que valida el cuerpo crudo con model_validate_json (JSON -> modelo en pydantic-core, sin dict intermedio)"""
+    async def parse_body(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            # Mismo formato 422 que la validación de cuerpo de FastAPI
+            raise RequestValidationError(
+                [{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)]
+            )
+    return parse_body
+
+def _json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Documentar en OpenAPI el cuerpo que FastAPI ya no infiere de la firma"""
+    return {
+        'requestBody': {
+            'required': True,
+            'content': {'application/json': {'schema': model.model_json_schema()}}
+        }
+    }
+
+@dataclass
+class TaskExecutionResponse:
     task_id: str
     agent_id: str
     status: str  # "queued", "running", "completed", "failed"
@@ -74,10 +130,11 @@ class TaskExecutionResponse(BaseModel):
     error: Optional[str] = None
     duration_ms: Optional[int] = None
     tokens_used: Optional[int] = None
-    created_at: datetime
+    created_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
 
-class AgentMemoryResponse(BaseModel):
+@dataclass
+class AgentMemoryResponse:
     total_interactions: int
     memory_size_mb: float
     context_types: List[str]
@@ -92,7 +149,8 @@ class AgentAPIService:
         self.app = FastAPI(
             title="TauseStack Agent API",
             description="API para gestión de agentes de IA multi-tenant",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse
         )
         
         self.security = HTTPBearer()
@@ -102,18 +160,41 @@ class AgentAPIService:
         )
         
         # Storage para agentes configurados
-        self.data_dir = Path(".tausestack_storage/agents")
+        self.data_dir = _STORAGE_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.agents_file = self.data_dir / "agent_configs.json"
-        self.tasks_file = self.data_dir / "task_history.json"
+        self.tasks_file = self.data_dir / "task_history.jsonl"
+        # Formato anterior (lista JSON completa), solo se lee para migrar
+        self.legacy_tasks_file = self.data_dir / "task_history.json"
         
         # Estado en memoria
         self.active_agents: Dict[str, TauseStackAgent] = {}
-        self.task_queue: List[TaskExecutionResponse] = []
-        self.task_history: List[TaskExecutionResponse] = []
+        # Cola de tareas en curso indexada por task_id (alta y baja O(1), orden de inserción)
+        self.task_queue: Dict[str, TaskExecutionResponse] = {}
+        self.task_history: Deque[TaskExecutionResponse] = deque(maxlen=_TASK_HISTORY_LIMIT)
+        # Índice del historial por task_id para búsquedas O(1)
+        self.task_history_by_id: Dict[str, TaskExecutionResponse] = {}
+        
+        # Historial en JSON Lines: líneas pendientes de anexar y líneas ya en disco
+        self._pending_task_lines: List[bytes] = []
+        self._history_lines = 0
+        self._history_needs_rewrite = False
+        
+        # Un escritor a la vez por archivo; los guardados concurrentes se agrupan y
+        # esperan el futuro del guardado pendiente. Locks y futuros se crean en el primer
+        # guardado, dentro del event loop (en Python 3.9 quedan ligados al loop vigente)
+        self._save_locks: Dict[str, asyncio.Lock] = {}
+        self._pending_saves: Dict[str, asyncio.Future] = {}
+        
+        # Escritura diferida del historial: sin startup se escribe en el acto
+        self._history_dirty: Optional[asyncio.Event] = None
+        self._history_flusher_task: Optional[asyncio.Task] = None
         
         # Configurar eventos
         self.app.add_event_handler("startup", self._load_agents)
+        self.app.add_event_handler("startup", self._start_history_flusher)
+        self.app.add_event_handler("shutdown", self._stop_history_flusher)
+        self.app.add_event_handler("shutdown", self.agent_manager.aclose)
         
         # Configurar rutas
         self._setup_routes()
@@ -122,47 +203,89 @@ class AgentAPIService:
         """Cargar agentes guardados al iniciar"""
         try:
             if self.agents_file.exists():
-                async with aiofiles.open(self.agents_file, 'r') as f:
+                async with aiofiles.open(self.agents_file, 'rb') as f:
                     content = await f.read()
-                    agents_data = json.loads(content)
+                    agents_data = orjson.loads(content)
                     
                     for agent_data in agents_data:
                         await self._recreate_agent_from_data(agent_data)
             
-            # Cargar historial de tareas
+            # Cargar historial de tareas (una tarea por línea)
+            tasks_data = []
             if self.tasks_file.exists():
-                async with aiofiles.open(self.tasks_file, 'r') as f:
+                async with aiofiles.open(self.tasks_file, 'rb') as f:
                     content = await f.read()
-                    tasks_data = json.loads(content)
-                    
-                    for task_data in tasks_data:
-                        task_data['created_at'] = datetime.fromisoformat(task_data['created_at'])
-                        if task_data.get('completed_at'):
-                            task_data['completed_at'] = datetime.fromisoformat(task_data['completed_at'])
-                        self.task_history.append(TaskExecutionResponse(**task_data))
+                    lines = content.splitlines()
+                    self._history_lines = len(lines)
+                    tasks_data = [orjson.loads(line) for line in lines if line]
+            elif self.legacy_tasks_file.exists():
+                async with aiofiles.open(self.legacy_tasks_file, 'rb') as f:
+                    content = await f.read()
+                    tasks_data = orjson.loads(content)
+                    # Migrar al formato JSONL en el próximo guardado
+                    self._history_needs_rewrite = True
+            
+            # Datos escritos por nosotros mismos: sin revalidar, solo parsear fechas
+            for task_data in tasks_data:
+                task_data['created_at'] = _as_datetime(task_data['created_at'])
+                task_data['completed_at'] = _as_datetime(task_data.get('completed_at'))
+                self._add_to_history(TaskExecutionResponse(**task_data))
                         
         except Exception as e:
             print(f"Error loading agents: {e}")
     
+    async def _start_history_flusher(self):
+        """Arrancar la tarea que agrupa escrituras del historial"""
+        self._history_dirty = asyncio.Event()
+        self._history_flusher_task = asyncio.create_task(self._history_flusher())
+    
+    async def _stop_history_flusher(self):
+        """Detener el flusher y volcar el historial pendiente"""
+        if self._history_flusher_task is not None:
+            self._history_flusher_task.cancel()
+            await asyncio.gather(self._history_flusher_task, return_exceptions=True)
+            self._history_flusher_task = None
+            await self._save_task_history()
+        self._history_dirty = None
+    
+    async def _history_flusher(self):
+        """Una escritura por ráfaga de tareas completadas"""
+        while True:
+            await self._history_dirty.wait()
+            await asyncio.sleep(_HISTORY_FLUSH_DELAY)
+            self._history_dirty.clear()
+            await self._save_task_history()
+    
+    async def _schedule_history_save(self):
+        """Marcar el historial como pendiente de guardar"""
+        if self._history_dirty is None:
+            await self._save_task_history()
+        else:
+            self._history_dirty.set()
+    
+    def _add_to_history(self, task: TaskExecutionResponse):
+        """Agregar una tarea al historial acotado, manteniendo el índice sincronizado"""
+        if len(self.task_history) == self.task_history.maxlen:
+            evicted = self.task_history[0]
+            self.task_history_by_id.pop(evicted.task_id, None)
+        self.task_history.append(task)
+        self.task_history_by_id[task.task_id] = task
+    
+    def _record_completed_task(self, task: TaskExecutionResponse):
+        """Mover una tarea terminada al historial y encolar su línea JSONL"""
+        self._add_to_history(task)
+        self._pending_task_lines.append(orjson.dumps(task))
+    
     async def _recreate_agent_from_data(self, agent_data: Dict[str, Any]):
         """Recrear un agente desde datos guardados"""
         try:
             # Recrear rol
             if agent_data.get('custom_role'):
-                role = AgentRole(**agent_data['custom_role'])
+                role = AgentRole.from_dict(agent_data['custom_role'])
             else:
                 # Usar rol preset
                 role_type = agent_data.get('role_type', 'research')
-                if role_type == 'research':
-                    role = PresetRoles.research_agent()
-                elif role_type == 'writer':
-                    role = PresetRoles.writer_agent()
-                elif role_type == 'customer_support':
-                    role = PresetRoles.customer_support_agent()
-                elif role_type == 'ecommerce':
-                    role = PresetRoles.ecommerce_agent()
-                else:
-                    role = PresetRoles.research_agent()  # Default
+                role = _PRESET_ROLES.get(role_type, PresetRoles.research_agent)()
             
             # Recrear configuración
             config = AgentConfig(
@@ -172,7 +295,9 @@ class AgentAPIService:
                 role=role,
                 enabled=agent_data.get('enabled', True),
                 custom_instructions=agent_data.get('custom_instructions'),
-                allowed_tools=agent_data.get('allowed_tools', [])
+                allowed_tools=agent_data.get('allowed_tools', []),
+                # Conservar la fecha de creación original del agente
+                created_at=_as_datetime(agent_data.get('created_at')) or datetime.now()
             )
             
             # Crear agente
@@ -183,50 +308,110 @@ class AgentAPIService:
         except Exception as e:
             print(f"Error recreating agent {agent_data.get('agent_id', 'unknown')}: {e}")
     
+    async def _coalesced_save(self, name: str, write: Callable[[], Awaitable[None]]):
+        """Ejecutar un guardado serializado por archivo, agrupando los concurrentes
+        
+        Si ya hay un guardado esperando el lock, su instantánea incluirá los cambios
+        de este llamador: basta con esperar a que termine en disco.
+        """
+        pending = self._pending_saves.get(name)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return
+        
+        pending = self._pending_saves[name] = asyncio.get_running_loop().create_future()
+        try:
+            lock = self._save_locks.get(name)
+            if lock is None:
+                lock = self._save_locks[name] = asyncio.Lock()
+            async with lock:
+                # Desde aquí los cambios nuevos requieren otra escritura
+                self._pending_saves.pop(name, None)
+                await write()
+        finally:
+            if self._pending_saves.get(name) is pending:
+                del self._pending_saves[name]
+            if not pending.done():
+                pending.set_result(None)
+    
     async def _save_agents(self):
         """Guardar configuraciones de agentes"""
+        await self._coalesced_save('agents', self._write_agents)
+    
+    async def _write_agents(self):
+        """Escribir la instantánea actual de los agentes"""
         try:
-            agents_data = []
-            for agent_id, agent in self.active_agents.items():
-                agent_data = {
+            agents_data = [
+                {
                     'agent_id': agent.config.agent_id,
                     'tenant_id': agent.config.tenant_id,
                     'name': agent.config.name,
-                    'role_type': agent.config.role.type.value if hasattr(agent.config.role, 'type') else 'custom',
-                    'custom_role': agent.config.role.to_dict() if hasattr(agent.config.role, 'to_dict') else None,
+                    'role_type': agent.config.role_type,
+                    'custom_role': agent.config.role_dict,
                     'enabled': agent.config.enabled,
                     'custom_instructions': agent.config.custom_instructions,
                     'allowed_tools': agent.config.allowed_tools,
-                    'created_at': datetime.now().isoformat()
+                    'created_at': agent.config.created_at
                 }
-                agents_data.append(agent_data)
+                for agent in self.active_agents.values()
+            ]
             
-            async with aiofiles.open(self.agents_file, 'w') as f:
-                await f.write(json.dumps(agents_data, indent=2))
+            # orjson serializa datetime de forma nativa (ISO 8601)
+            async with aiofiles.open(self.agents_file, 'wb') as f:
+                await f.write(orjson.dumps(agents_data))
                 
         except Exception as e:
             print(f"Error saving agents: {e}")
     
     async def _save_task_history(self):
-        """Guardar historial de tareas"""
+        """Guardar historial de tareas: anexar líneas nuevas y rotar el archivo cuando crece"""
+        await self._coalesced_save('tasks', self._write_task_history)
+    
+    async def _write_task_history(self):
+        """Vaciar las líneas pendientes del historial (o reescribirlo al rotar)"""
         try:
-            # Mantener solo las últimas 500 tareas
-            recent_history = self.task_history[-500:]
+            pending = self._pending_task_lines
+            self._pending_task_lines = []
+            
+            if self._history_needs_rewrite or self._history_lines + len(pending) > _TASK_HISTORY_ROTATE_AT:
+                # Rotación: reescribir desde el deque, que ya conserva solo las últimas 500 tareas
+                lines = [orjson.dumps(task) for task in self.task_history]
+                mode = 'wb'
+                self._history_lines = 0
+                self._history_needs_rewrite = False
+            else:
+                lines = pending
+                mode = 'ab'
             
-            tasks_data = []
-            for task in recent_history:
-                task_dict = task.dict()
-                task_dict['created_at'] = task_dict['created_at'].isoformat()
-                if task_dict.get('completed_at'):
-                    task_dict['completed_at'] = task_dict['completed_at'].isoformat()
-                tasks_data.append(task_dict)
-            
-            async with aiofiles.open(self.tasks_file, 'w') as f:
-                await f.write(json.dumps(tasks_data, indent=2))
+            if not lines:
+                return
+            
+            # orjson serializa datetime de forma nativa (ISO 8601)
+            async with aiofiles.open(self.tasks_file, mode) as f:
+                await f.write(b"\n".join(lines) + b"\n")
+            self._history_lines += len(lines)
                 
         except Exception as e:
             print(f"Error saving task history: {e}")
     
+    def _status_model(self, agent: TauseStackAgent, status: Dict[str, Any]) -> AgentStatusModel:
+        """Construir AgentStatusModel desde el estado interno del agente (sin revalidar)"""
+        stats = status['stats']
+        return AgentStatusModel(
+            agent_id=agent.config.agent_id,
+            name=agent.config.name,
+            tenant_id=agent.config.tenant_id,
+            role_name=agent.config.role.name,
+            enabled=status['enabled'],
+            is_busy=status['is_busy'],
+            tasks_completed=stats['tasks_completed'],
+            tasks_failed=stats['tasks_failed'],
+            total_tokens_used=stats['total_tokens_used'],
+            total_execution_time_ms=stats['total_execution_time_ms'],
+            memory_size=status['memory_size'],
+            last_activity=_as_datetime(status.get('last_activity'))
+        )
+    
     def _setup_routes(self):
         """Configurar todas las rutas del API"""
         
@@ -242,52 +427,38 @@ class AgentAPIService:
                 "queue_size": len(self.task_queue)
             }
         
-        @self.app.get("/agents", response_model=List[AgentStatusModel])
+        @self.app.get("/agents")
         async def list_agents():
             """Listar todos los agentes configurados"""
-            agents_status = []
-            
-            for agent_id, agent in self.active_agents.items():
-                status = await agent.get_status()
-                agent_status = AgentStatusModel(
-                    agent_id=agent.config.agent_id,
-                    name=agent.config.name,
-                    tenant_id=agent.config.tenant_id,
-                    role_name=agent.config.role.name,
-                    enabled=status['enabled'],
-                    is_busy=status['is_busy'],
-                    tasks_completed=status['stats']['tasks_completed'],
-                    tasks_failed=status['stats']['tasks_failed'],
-                    total_tokens_used=status['stats']['total_tokens_used'],
-                    total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                    memory_size=status['memory_size'],
-                    last_activity=status.get('last_activity')
-                )
-                agents_status.append(agent_status)
-            
-            return agents_status
+            agents = list(self.active_agents.values())
+            
+            # Consultar el estado de todos los agentes en paralelo; un agente que falla no tumba el listado
+            statuses = await asyncio.gather(*(agent.get_status() for agent in agents), return_exceptions=True)
+            
+            models = []
+            for agent, status in zip(agents, statuses):
+                if isinstance(status, BaseException):
+                    logger.error("Error getting status for agent %s: %s", agent.config.agent_id, status)
+                    continue
+                models.append(self._status_model(agent, status))
+            return models
         
-        @self.app.post("/agents", response_model=AgentStatusModel)
-        async def create_agent(request: AgentCreateRequest):
+        @self.app.post("/agents", openapi_extra=_json_body_openapi(AgentCreateRequest))
+        async def create_agent(request: AgentCreateRequest = Depends(_json_body(AgentCreateRequest))):
             """Crear un nuevo agente"""
             # Generar ID único
-            agent_id = f"{request.name.lower().replace(' ', '-')}-{str(uuid.uuid4())[:8]}"
+            slug = request.name.lower().replace(' ', '-')
+            agent_id = f"{slug}-{uuid.uuid4().hex[:8]}"
             
             # Crear rol
             if request.role_type == "custom" and request.custom_role:
                 role = AgentRole(**request.custom_role)
             else:
                 # Usar rol preset
-                if request.role_type == "research":
-                    role = PresetRoles.research_agent()
-                elif request.role_type == "writer":
-                    role = PresetRoles.writer_agent()
-                elif request.role_type == "customer_support":
-                    role = PresetRoles.customer_support_agent()
-                elif request.role_type == "ecommerce":
-                    role = PresetRoles.ecommerce_agent()
-                else:
+                role_factory = _PRESET_ROLES.get(request.role_type)
+                if role_factory is None:
                     raise HTTPException(status_code=400, detail="Tipo de rol no válido")
+                role = role_factory()
             
             # Crear configuración
             config = AgentConfig(
@@ -309,22 +480,9 @@ class AgentAPIService:
             
             # Retornar status
             status = await agent.get_status()
-            return AgentStatusModel(
-                agent_id=agent.config.agent_id,
-                name=agent.config.name,
-                tenant_id=agent.config.tenant_id,
-                role_name=agent.config.role.name,
-                enabled=status['enabled'],
-                is_busy=status['is_busy'],
-                tasks_completed=status['stats']['tasks_completed'],
-                tasks_failed=status['stats']['tasks_failed'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                memory_size=status['memory_size'],
-                last_activity=status.get('last_activity')
-            )
+            return self._status_model(agent, status)
         
-        @self.app.get("/agents/{agent_id}", response_model=AgentStatusModel)
+        @self.app.get("/agents/{agent_id}")
         async def get_agent(agent_id: str):
             """Obtener información de un agente específico"""
             if agent_id not in self.active_agents:
@@ -333,22 +491,9 @@ class AgentAPIService:
             agent = self.active_agents[agent_id]
             status = await agent.get_status()
             
-            return AgentStatusModel(
-                agent_id=agent.config.agent_id,
-                name=agent.config.name,
-                tenant_id=agent.config.tenant_id,
-                role_name=agent.config.role.name,
-                enabled=status['enabled'],
-                is_busy=status['is_busy'],
-                tasks_completed=status['stats']['tasks_completed'],
-                tasks_failed=status['stats']['tasks_failed'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                memory_size=status['memory_size'],
-                last_activity=status.get('last_activity')
-            )
+            return self._status_model(agent, status)
         
-        @self.app.put("/agents/{agent_id}", response_model=AgentStatusModel)
+        @self.app.put("/agents/{agent_id}")
         async def update_agent(agent_id: str, request: AgentUpdateRequest):
             """Actualizar configuración de un agente"""
             if agent_id not in self.active_agents:
@@ -356,34 +501,13 @@ class AgentAPIService:
             
             agent = self.active_agents[agent_id]
             
-            # Actualizar configuración
-            if request.name is not None:
-                agent.config.name = request.name
-            if request.enabled is not None:
-                agent.config.enabled = request.enabled
-            if request.custom_instructions is not None:
-                agent.config.custom_instructions = request.custom_instructions
-            if request.allowed_tools is not None:
-                agent.config.allowed_tools = request.allowed_tools
-            
+            # Actualizar configuración (invalida los cachés del agente y sincroniza herramientas)
+            await agent.update_config(**request.model_dump(exclude_none=True))
             await self._save_agents()
             
             # Retornar status actualizado
             status = await agent.get_status()
-            return AgentStatusModel(
-                agent_id=agent.config.agent_id,
-                name=agent.config.name,
-                tenant_id=agent.config.tenant_id,
-                role_name=agent.config.role.name,
-                enabled=status['enabled'],
-                is_busy=status['is_busy'],
-                tasks_completed=status['stats']['tasks_completed'],
-                tasks_failed=status['stats']['tasks_failed'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                memory_size=status['memory_size'],
-                last_activity=status.get('last_activity')
-            )
+            return self._status_model(agent, status)
         
         @self.app.delete("/agents/{agent_id}")
         async def delete_agent(agent_id: str):
@@ -392,14 +516,18 @@ class AgentAPIService:
                 raise HTTPException(status_code=404, detail="Agente no encontrado")
             
             # Remover del manager y memoria
-            self.agent_manager.remove_agent(agent_id)
+            await self.agent_manager.remove_agent(agent_id)
             del self.active_agents[agent_id]
             await self._save_agents()
             
             return {"message": f"Agente {agent_id} eliminado exitosamente"}
         
-        @self.app.post("/agents/{agent_id}/execute", response_model=TaskExecutionResponse)
-        async def execute_task(agent_id: str, request: TaskExecutionRequest, background_tasks: BackgroundTasks):
+        @self.app.post("/agents/{agent_id}/execute", openapi_extra=_json_body_openapi(TaskExecutionRequest))
+        async def execute_task(
+            agent_id: str,
+            background_tasks: BackgroundTasks,
+            request: TaskExecutionRequest = Depends(_json_body(TaskExecutionRequest))
+        ):
             """Ejecutar una tarea en un agente específico"""
             if agent_id not in self.active_agents:
                 raise HTTPException(status_code=404, detail="Agente no encontrado")
@@ -418,14 +546,14 @@ class AgentAPIService:
                 created_at=datetime.now()
             )
             
-            self.task_queue.append(task_response)
+            self.task_queue[task_id] = task_response
             
             # Ejecutar en background
             background_tasks.add_task(self._execute_task_background, task_response, agent, request)
             
             return task_response
         
-        @self.app.get("/agents/{agent_id}/memory", response_model=AgentMemoryResponse)
+        @self.app.get("/agents/{agent_id}/memory")
         async def get_agent_memory(agent_id: str):
             """Obtener información de memoria de un agente"""
             if agent_id not in self.active_agents:
@@ -434,30 +562,31 @@ class AgentAPIService:
             agent = self.active_agents[agent_id]
             memory_summary = await agent.get_memory_summary()
             
-            return AgentMemoryResponse(**memory_summary)
+            return AgentMemoryResponse(
+                total_interactions=memory_summary['total_interactions'],
+                memory_size_mb=memory_summary['memory_size_mb'],
+                context_types=memory_summary['context_types'],
+                last_activity=_as_datetime(memory_summary.get('last_activity')),
+                task_statistics=memory_summary['task_statistics']
+            )
         
-        @self.app.get("/tasks", response_model=List[TaskExecutionResponse])
+        @self.app.get("/tasks")
         async def list_tasks(limit: int = 50, agent_id: Optional[str] = None):
             """Listar historial de tareas"""
-            tasks = self.task_history[-limit:]
+            tasks = list(self.task_history)[-limit:]
             
             if agent_id:
                 tasks = [t for t in tasks if t.agent_id == agent_id]
             
             return tasks
         
-        @self.app.get("/tasks/{task_id}", response_model=TaskExecutionResponse)
+        @self.app.get("/tasks/{task_id}")
         async def get_task(task_id: str):
             """Obtener información de una tarea específica"""
-            # Buscar en queue primero
-            for task in self.task_queue:
-                if task.task_id == task_id:
-                    return task
-            
-            # Buscar en historial
-            for task in self.task_history:
-                if task.task_id == task_id:
-                    return task
+            # Buscar en queue primero, luego en historial
+            task = self.task_queue.get(task_id) or self.task_history_by_id.get(task_id)
+            if task is not None:
+                return task
             
             raise HTTPException(status_code=404, detail="Tarea no encontrada")
     
@@ -486,22 +615,20 @@ class AgentAPIService:
                 task_response.error = result.error_message
             
             # Mover de queue a historial
-            if task_response in self.task_queue:
-                self.task_queue.remove(task_response)
-            self.task_history.append(task_response)
+            self.task_queue.pop(task_response.task_id, None)
+            self._record_completed_task(task_response)
             
-            await self._save_task_history()
+            await self._schedule_history_save()
             
         except Exception as e:
             task_response.status = "failed"
             task_response.error = str(e)
             task_response.completed_at = datetime.now()
             
-            if task_response in self.task_queue:
-                self.task_queue.remove(task_response)
-            self.task_history.append(task_response)
+            self.task_queue.pop(task_response.task_id, None)
+            self._record_completed_task(task_response)
             
-            await self._save_task_history()
+            await self._schedule_history_save()
 
 
 # ========================= STARTUP =========================
@@ -511,9 +638,12 @@ agent_service = AgentAPIService()
 app = agent_service.app
 
 if __name__ == "__main__":
+    # uvloop y httptools vienen con uvicorn[standard]
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8003,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     ) 
\ No newline at end of file
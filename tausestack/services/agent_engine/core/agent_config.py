@@ -30,11 +30,13 @@ class AgentConfig:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Instrucciones efectivas memoizadas: (role, custom_instructions, texto)
+    _instructions_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Inicialización después de crear el objeto"""
         if not self.allowed_tools:
-            self.allowed_tools = self.role.tools.copy()
+            self.allowed_tools = list(self.role.tools)
         
         if not self.api_preferences:
             self.api_preferences = {
@@ -43,6 +45,16 @@ class AgentConfig:
                 'max_tokens': self.role.max_tokens
             }
     
+    @property
+    def role_type(self) -> str:
+        """Tipo del rol como string (para persistencia)"""
+        return self.role.type.value
+    
+    @property
+    def role_dict(self) -> Dict[str, Any]:
+        """Rol serializado como diccionario (para persistencia)"""
+        return self.role.to_dict()
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convertir a diccionario para serialización"""
         return {
@@ -103,13 +115,17 @@ class AgentConfig:
     
     def get_effective_instructions(self) -> str:
         """Obtener instrucciones efectivas (rol + personalizadas)"""
-        instructions = f"Role: {self.role.name}\n"
-        instructions += f"Goal: {self.role.goal}\n"
-        instructions += f"Backstory: {self.role.backstory}\n"
+        # Se recalculan solo si cambia el rol o las instrucciones, incluso si se asignan directamente
+        cached = self._instructions_cache
+        if cached is not None and cached[0] is self.role and cached[1] is self.custom_instructions:
+            return cached[2]
+        
+        instructions = f"Role: {self.role.name}\nGoal: {self.role.goal}\nBackstory: {self.role.backstory}\n"
         
         if self.custom_instructions:
             instructions += f"\nCustom Instructions: {self.custom_instructions}\n"
         
+        self._instructions_cache = (self.role, self.custom_instructions, instructions)
         return instructions
     
     def get_model_config(self) -> Dict[str, Any]:
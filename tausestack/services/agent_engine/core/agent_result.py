@@ -2,11 +2,23 @@
 Agent Result - Resultados y métricas de la ejecución de agentes
 """
 
+import sys
+import time
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+import orjson
+
+# __slots__ en los dataclasses de resultados (dataclass(slots=...) requiere Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _datetime_to_ns(value: datetime) -> int:
+    """Convertir datetime a ns desde epoch (para resultados reconstruidos desde JSON)"""
+    return int(value.timestamp() * 1_000_000) * 1_000
+
 
 class TaskStatus(str, Enum):
     """Estados de las tareas"""
@@ -17,7 +29,11 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Búsqueda directa valor -> miembro, sin la llamada a TaskStatus(...)
+_TASK_STATUS_BY_VALUE: Dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AgentMetrics:
     """Métricas de ejecución del agente"""
     execution_time_ms: int
@@ -38,7 +54,7 @@ class AgentMetrics:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AgentResult:
     """
     Resultado de la ejecución de un agente
@@ -54,6 +70,15 @@ class AgentResult:
     completed_at: Optional[datetime] = None
     intermediate_results: List[Any] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Marcas internas en ns desde epoch para calcular duraciones sin datetime/timedelta
+    # (fuera del constructor; orjson omite los campos con prefijo '_', el JSON no cambia)
+    _created_ns: int = field(default=0, init=False, repr=False, compare=False)
+    _completed_ns: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._created_ns = _datetime_to_ns(self.created_at)
+        if self.completed_at is not None:
+            self._completed_ns = _datetime_to_ns(self.completed_at)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertir a diccionario para serialización"""
@@ -61,7 +86,8 @@ class AgentResult:
             'task_id': self.task_id,
             'agent_id': self.agent_id,
             'tenant_id': self.tenant_id,
-            'status': self.status.value,
+            # TaskStatus hereda de str: se empaqueta tal cual, sin pasar por .value
+            'status': self.status,
             'result': self.result,
             'error_message': self.error_message,
             'metrics': self.metrics.to_dict() if self.metrics else None,
@@ -71,6 +97,16 @@ class AgentResult:
             'metadata': self.metadata
         }
     
+    def to_json(self) -> bytes:
+        """Serializar a JSON (bytes) con orjson, directamente desde el dataclass"""
+        # orjson serializa dataclasses, Enum y datetime de forma nativa: mismo JSON que to_dict()
+        return orjson.dumps(self)
+    
+    @classmethod
+    def from_json(cls, data: bytes) -> 'AgentResult':
+        """Crear desde JSON (bytes o str) con orjson"""
+        return cls.from_dict(orjson.loads(data))
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AgentResult':
         """Crear desde diccionario"""
@@ -82,7 +118,7 @@ class AgentResult:
             task_id=data['task_id'],
             agent_id=data['agent_id'],
             tenant_id=data['tenant_id'],
-            status=TaskStatus(data['status']),
+            status=_TASK_STATUS_BY_VALUE[data['status']],
             result=data['result'],
             error_message=data.get('error_message'),
             metrics=metrics,
@@ -96,6 +132,7 @@ class AgentResult:
         """Marcar como completado"""
         self.status = TaskStatus.COMPLETED
         self.result = result
+        self._completed_ns = time.time_ns()
         self.completed_at = datetime.now()
         if metrics:
             self.metrics = metrics
@@ -104,6 +141,7 @@ class AgentResult:
         """Marcar como fallido"""
         self.status = TaskStatus.FAILED
         self.error_message = error_message
+        self._completed_ns = time.time_ns()
         self.completed_at = datetime.now()
     
     def add_intermediate_result(self, result: Any):
@@ -115,8 +153,8 @@ class AgentResult:
     
     def get_duration_ms(self) -> Optional[int]:
         """Obtener duración en milisegundos"""
-        if self.completed_at:
-            return int((self.completed_at - self.created_at).total_seconds() * 1000)
+        if self._completed_ns is not None:
+            return (self._completed_ns - self._created_ns) // 1_000_000
         return None
     
     def is_successful(self) -> bool:
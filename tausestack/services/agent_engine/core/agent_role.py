@@ -2,9 +2,14 @@
 Agent Role - Definición de roles y responsabilidades de agentes
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import sys
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+
+# __slots__ en el dataclass del rol (dataclass(slots=...) requiere Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class AgentType(str, Enum):
@@ -18,27 +23,31 @@ class AgentType(str, Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+# Búsqueda directa valor -> miembro, sin la llamada a AgentType(...)
+_AGENT_TYPE_BY_VALUE: Dict[str, AgentType] = {agent_type.value: agent_type for agent_type in AgentType}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AgentRole:
     """
-    Definición de un rol de agente con sus capacidades y configuraciones
+    Definición de un rol de agente con sus capacidades y configuraciones (inmutable)
     """
     name: str
     type: AgentType
     goal: str
     backstory: str
-    tools: List[str]
+    tools: Tuple[str, ...]
     max_tokens: int = 4000
     temperature: float = 0.7
     model_preference: str = "gpt-4"
-    config: Dict[str, Any] = None
+    config: Mapping[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
-        if self.config is None:
-            self.config = {}
+        # Tupla inmutable de nombres internados: se comparte sin copias y las búsquedas comparan por identidad
+        object.__setattr__(self, 'tools', tuple(sys.intern(tool) for tool in self.tools))
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convertir a diccionario para serialización"""
+        """Convertir a diccionario para serialización (literal explícito, sin dataclasses.asdict)"""
         return {
             'name': self.name,
             'type': self.type.value,
@@ -48,7 +57,8 @@ class AgentRole:
             'max_tokens': self.max_tokens,
             'temperature': self.temperature,
             'model_preference': self.model_preference,
-            'config': self.config
+            # dict() también convierte configs de solo lectura (MappingProxyType) a algo serializable
+            'config': dict(self.config)
         }
     
     @classmethod
@@ -56,84 +66,90 @@ class AgentRole:
         """Crear desde diccionario"""
         return cls(
             name=data['name'],
-            type=AgentType(data['type']),
+            type=_AGENT_TYPE_BY_VALUE[data['type']],
             goal=data['goal'],
             backstory=data['backstory'],
             tools=data['tools'],
             max_tokens=data.get('max_tokens', 4000),
             temperature=data.get('temperature', 0.7),
             model_preference=data.get('model_preference', 'gpt-4'),
-            config=data.get('config', {})
+            config=data.get('config') or {}
         )
 
 
-# Roles predefinidos
+# Config del preset de ecommerce: de solo lectura porque la instancia del preset es compartida
+_ECOMMERCE_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "saleor_enabled": True,
+    "wompi_enabled": True,
+    "colombia_market": True
+})
+
+# Roles predefinidos, construidos una sola vez al importar (AgentRole es inmutable)
+_PRESETS: Dict[AgentType, AgentRole] = {
+    AgentType.RESEARCH: AgentRole(
+        name="Research Agent",
+        type=AgentType.RESEARCH,
+        goal="Realizar investigación exhaustiva sobre temas específicos",
+        backstory="Soy un experto investigador con acceso a múltiples fuentes de información. Mi especialidad es encontrar datos relevantes y verificar información.",
+        tools=["web_search", "data_analysis", "summarization"],
+        temperature=0.3,
+        model_preference="gpt-4"
+    ),
+    AgentType.WRITER: AgentRole(
+        name="Writer Agent", 
+        type=AgentType.WRITER,
+        goal="Crear contenido escrito de alta calidad",
+        backstory="Soy un escritor experto capaz de crear contenido en múltiples formatos y estilos. Puedo adaptar mi escritura para diferentes audiencias.",
+        tools=["content_generation", "grammar_check", "style_adaptation"],
+        temperature=0.7,
+        model_preference="claude-3-sonnet-20240229"
+    ),
+    AgentType.CUSTOMER_SUPPORT: AgentRole(
+        name="Customer Support Agent",
+        type=AgentType.CUSTOMER_SUPPORT,
+        goal="Brindar soporte excepcional a clientes",
+        backstory="Soy un especialista en atención al cliente con amplia experiencia resolviendo problemas. Siempre mantengo un tono amigable y profesional.",
+        tools=["knowledge_base", "ticket_management", "escalation"],
+        temperature=0.4,
+        model_preference="gpt-4"
+    ),
+    AgentType.ECOMMERCE: AgentRole(
+        name="Ecommerce Agent",
+        type=AgentType.ECOMMERCE,
+        goal="Optimizar operaciones de ecommerce y mejorar ventas",
+        backstory="Soy un experto en ecommerce con conocimiento profundo de Saleor, Wompi y el mercado colombiano. Puedo ayudar con inventario, pagos y estrategias de venta.",
+        tools=["saleor_integration", "wompi_payments", "inventory_management", "sales_analysis"],
+        temperature=0.5,
+        model_preference="gpt-4",
+        config=_ECOMMERCE_CONFIG
+    ),
+}
+
+
 class PresetRoles:
     """Roles predefinidos comunes"""
     
     @staticmethod
     def research_agent() -> AgentRole:
         """Agente de investigación"""
-        return AgentRole(
-            name="Research Agent",
-            type=AgentType.RESEARCH,
-            goal="Realizar investigación exhaustiva sobre temas específicos",
-            backstory="Soy un experto investigador con acceso a múltiples fuentes de información. Mi especialidad es encontrar datos relevantes y verificar información.",
-            tools=["web_search", "data_analysis", "summarization"],
-            temperature=0.3,
-            model_preference="gpt-4"
-        )
+        return _PRESETS[AgentType.RESEARCH]
     
     @staticmethod
     def writer_agent() -> AgentRole:
         """Agente de escritura"""
-        return AgentRole(
-            name="Writer Agent", 
-            type=AgentType.WRITER,
-            goal="Crear contenido escrito de alta calidad",
-            backstory="Soy un escritor experto capaz de crear contenido en múltiples formatos y estilos. Puedo adaptar mi escritura para diferentes audiencias.",
-            tools=["content_generation", "grammar_check", "style_adaptation"],
-            temperature=0.7,
-            model_preference="claude-3-sonnet-20240229"
-        )
+        return _PRESETS[AgentType.WRITER]
     
     @staticmethod
     def customer_support_agent() -> AgentRole:
         """Agente de soporte al cliente"""
-        return AgentRole(
-            name="Customer Support Agent",
-            type=AgentType.CUSTOMER_SUPPORT,
-            goal="Brindar soporte excepcional a clientes",
-            backstory="Soy un especialista en atención al cliente con amplia experiencia resolviendo problemas. Siempre mantengo un tono amigable y profesional.",
-            tools=["knowledge_base", "ticket_management", "escalation"],
-            temperature=0.4,
-            model_preference="gpt-4"
-        )
+        return _PRESETS[AgentType.CUSTOMER_SUPPORT]
     
     @staticmethod
     def ecommerce_agent() -> AgentRole:
         """Agente especializado en ecommerce"""
-        return AgentRole(
-            name="Ecommerce Agent",
-            type=AgentType.ECOMMERCE,
-            goal="Optimizar operaciones de ecommerce y mejorar ventas",
-            backstory="Soy un experto en ecommerce con conocimiento profundo de Saleor, Wompi y el mercado colombiano. Puedo ayudar con inventario, pagos y estrategias de venta.",
-            tools=["saleor_integration", "wompi_payments", "inventory_management", "sales_analysis"],
-            temperature=0.5,
-            model_preference="gpt-4",
-            config={
-                "saleor_enabled": True,
-                "wompi_enabled": True,
-                "colombia_market": True
-            }
-        )
+        return _PRESETS[AgentType.ECOMMERCE]
     
     @staticmethod
     def get_all_presets() -> List[AgentRole]:
         """Obtener todos los roles predefinidos"""
-        return [
-            PresetRoles.research_agent(),
-            PresetRoles.writer_agent(),
-            PresetRoles.customer_support_agent(),
-            PresetRoles.ecommerce_agent()
-        ] 
\ No newline at end of file
+        return list(_PRESETS.values())
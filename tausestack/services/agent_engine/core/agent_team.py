@@ -304,7 +304,7 @@ class AgentTeam:
         if self.is_busy:
             raise ValueError("El equipo está ocupado ejecutando otro workflow")
         
-        execution_id = str(uuid.uuid4())
+        execution_id = uuid.uuid4().hex
         start_time = datetime.now()
         self.is_busy = True
         self.current_execution = execution_id
@@ -2,12 +2,17 @@
 TauseStack Agent - Agente base que usa la infraestructura existente de TauseStack
 """
 
-import uuid
+import secrets
 import asyncio
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-import json
+import logging
+import random
+import time
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Union
 import httpx
+import orjson
 
 from .agent_role import AgentRole
 from .agent_config import AgentConfig
@@ -15,6 +20,73 @@ from .agent_result import AgentResult, AgentMetrics, TaskStatus
 from ..memory.agent_memory import AgentMemory
 from ..tools.agent_tools import AgentToolsManager
 
+logger = logging.getLogger(__name__)
+
+# Segundos durante los que get_status reutiliza el último estado calculado
+_STATUS_CACHE_TTL = 0.1
+
+# Pool de conexiones keep-alive hacia el API Gateway (un cliente por agente)
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# Esperas base entre reintentos (s); se aplica jitter de ±50% para no sincronizar reintentos
+_BACKOFFS = (0.1, 0.3, 0.7, 1.5, 3.1)
+
+
+class AIServiceError(Exception):
+    """Respuesta de error del AI Service"""
+    
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"AI Service error: {status_code} - {detail}")
+        self.status_code = status_code
+    
+    @property
+    def retryable(self) -> bool:
+        """Solo los errores del servidor y el rate limit justifican reintentar"""
+        return self.status_code >= 500 or self.status_code == 429
+
+
+# Cabeceras del payload ya serializado con orjson
+_JSON_HEADERS = {'content-type': 'application/json'}
+
+# Contexto del usuario legible en el prompt; claves no-str permitidas como en json.dumps
+_PROMPT_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+# Ruta del AI Service por familia de modelo (prefijo antes del primer guion)
+_MODEL_ROUTES = {
+    'gpt': '/ai/openai/completion',
+    'claude': '/ai/claude/completion'
+}
+_DEFAULT_MODEL_ROUTE = '/ai/completion'
+
+
+@lru_cache(maxsize=64)
+def _endpoint_for(api_base_url: str, model: str) -> str:
+    """Endpoint del AI Service para un modelo (compartido entre agentes con la misma combinación)"""
+    route = _MODEL_ROUTES.get(model.split('-', 1)[0])
+    if route is None:
+        # Nombres sin guion tras la familia (p. ej. "gpt4") siguen enrutándose por prefijo
+        route = next(
+            (route for prefix, route in _MODEL_ROUTES.items() if model.startswith(prefix)),
+            _DEFAULT_MODEL_ROUTE
+        )
+    return f"{api_base_url}{route}"
+
+
+class _AgentStats:
+    """Contadores de ejecución del agente (atributos con __slots__ en lugar de un dict)"""
+    __slots__ = ('tasks_completed', 'tasks_failed', 'total_tokens_used', 'total_execution_time_ms')
+    
+    def __init__(self):
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.total_tokens_used = 0
+        self.total_execution_time_ms = 0
+    
+    def asdict(self) -> Dict[str, int]:
+        """Convertir a diccionario para serialización"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class TauseStackAgent:
     """
@@ -29,7 +101,8 @@ class TauseStackAgent:
         self, 
         config: AgentConfig,
         api_base_url: str = "http://localhost:9001",
-        storage_path: str = ".tausestack_storage"
+        storage_path: Union[str, Path] = ".tausestack_storage",
+        tenant_dir: Optional[Path] = None
     ):
         self.config = config
         self.api_base_url = api_base_url
@@ -39,7 +112,8 @@ class TauseStackAgent:
         self.memory = AgentMemory(
             agent_id=config.agent_id,
             tenant_id=config.tenant_id,
-            storage_path=storage_path
+            storage_path=storage_path,
+            tenant_dir=tenant_dir
         )
         
         self.tools_manager = AgentToolsManager(
@@ -47,27 +121,65 @@ class TauseStackAgent:
             restricted_tools=config.restricted_tools
         )
         
-        # Estado del agente
-        self.is_busy = False
-        self.current_task_id: Optional[str] = None
-        self.stats = {
-            'tasks_completed': 0,
-            'tasks_failed': 0,
-            'total_tokens_used': 0,
-            'total_execution_time_ms': 0
-        }
+        # Estado del agente: tareas en curso acotadas por max_concurrent_tasks (leído en cada
+        # admisión, así update_config aplica el nuevo límite). La condición se crea dentro del loop
+        self._slots: Optional[asyncio.Condition] = None
+        self._inflight: Set[str] = set()
+        # Escrituras de memoria en segundo plano pendientes (se esperan en aclose)
+        self._pending: Set[asyncio.Task] = set()
+        self.stats = _AgentStats()
+        # Último estado calculado: (time.monotonic(), status)
+        self._status_cache: Optional[tuple] = None
+        # Configuración del modelo cacheada hasta el próximo update_config
+        self._model_config_cache: Optional[Dict[str, Any]] = None
+        
+        # Cliente HTTP compartido entre tareas: reutiliza conexiones en lugar de un handshake por llamada.
+        # Se crea en la primera llamada y aclose lo libera (un agente reutilizado tras cerrarse abre otro)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._endpoint = self._resolve_endpoint()
     
     async def execute_task(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
         """
-        Ejecutar una tarea específica
+        Ejecutar una tarea específica (espera turno si el agente ya tiene max_concurrent_tasks en curso)
         """
-        if self.is_busy:
-            raise Exception("Agent is currently busy with another task")
-        
-        task_id = str(uuid.uuid4())
-        self.current_task_id = task_id
-        self.is_busy = True
+        task_id = secrets.token_hex(16)
+        slots = self._slot_condition()
         
+        async with slots:
+            await slots.wait_for(lambda: len(self._inflight) < self._max_concurrent_tasks())
+            self._inflight.add(task_id)
+        self.invalidate_status_cache()
+        try:
+            return await self._run_task(task_id, task, context)
+        finally:
+            async with slots:
+                self._inflight.discard(task_id)
+                slots.notify()
+            self.invalidate_status_cache()
+    
+    def _slot_condition(self) -> asyncio.Condition:
+        """Condición que coordina la admisión de tareas"""
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        return self._slots
+    
+    def _max_concurrent_tasks(self) -> int:
+        """Límite vigente de tareas simultáneas"""
+        return self.config.max_concurrent_tasks or 8
+    
+    def _on_memory_write_done(self, write: asyncio.Task):
+        """Liberar la escritura terminada y reportar fallos (nadie la espera)"""
+        self._pending.discard(write)
+        if not write.cancelled() and write.exception() is not None:
+            logger.error("Error saving memory for agent %s: %s", self.config.agent_id, write.exception())
+    
+    @property
+    def is_busy(self) -> bool:
+        """Indica si el agente tiene tareas en curso"""
+        return bool(self._inflight)
+    
+    async def _run_task(self, task_id: str, task: str, context: Optional[Dict[str, Any]]) -> AgentResult:
+        """Ejecutar la tarea y registrar métricas y estadísticas"""
         # Crear resultado inicial
         result = AgentResult(
             task_id=task_id,
@@ -77,7 +189,7 @@ class TauseStackAgent:
             result=None
         )
         
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Preparar contexto
@@ -86,38 +198,35 @@ class TauseStackAgent:
             # Ejecutar tarea con reintentos
             task_result = await self._execute_with_retry(task, full_context)
             
-            # Guardar en memoria
-            await self.memory.add_interaction(task, task_result)
+            # Guardar en memoria fuera del camino crítico de la respuesta
+            write = asyncio.create_task(self.memory.add_interaction(task, task_result))
+            self._pending.add(write)
+            write.add_done_callback(self._on_memory_write_done)
             
             # Calcular métricas
-            end_time = datetime.now()
-            execution_time = int((end_time - start_time).total_seconds() * 1000)
+            execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             metrics = AgentMetrics(
                 execution_time_ms=execution_time,
                 tokens_used=task_result.get('tokens_used', 0),
                 api_calls=1,
-                model_used=self.config.get_model_config()['model']
+                model_used=self._get_model_config()['model']
             )
             
             # Actualizar resultado
             result.mark_completed(task_result, metrics)
             
             # Actualizar estadísticas
-            self.stats['tasks_completed'] += 1
-            self.stats['total_tokens_used'] += metrics.tokens_used
-            self.stats['total_execution_time_ms'] += execution_time
+            self.stats.tasks_completed += 1
+            self.stats.total_tokens_used += metrics.tokens_used
+            self.stats.total_execution_time_ms += execution_time
             
             return result
             
         except Exception as e:
             result.mark_failed(str(e))
-            self.stats['tasks_failed'] += 1
+            self.stats.tasks_failed += 1
             return result
-            
-        finally:
-            self.is_busy = False
-            self.current_task_id = None
     
     async def _prepare_context(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Preparar contexto completo para la tarea"""
@@ -132,7 +241,7 @@ class TauseStackAgent:
             'memory_context': memory_context,
             'user_context': context,
             'available_tools': self.tools_manager.get_available_tools(),
-            'model_config': self.config.get_model_config()
+            'model_config': self._get_model_config()
         }
         
         return full_context
@@ -143,12 +252,16 @@ class TauseStackAgent:
         for attempt in range(self.config.retry_attempts):
             try:
                 return await self._call_ai_service(task, context)
-            except Exception as e:
+            except (httpx.TransportError, AIServiceError) as e:
+                # Errores 4xx no se reintentan: volverían a fallar igual
+                if isinstance(e, AIServiceError) and not e.retryable:
+                    raise
                 if attempt == self.config.retry_attempts - 1:
-                    raise e
+                    raise
                 
                 # Esperar antes del siguiente intento
-                await asyncio.sleep(2 ** attempt)
+                backoff = _BACKOFFS[min(attempt, len(_BACKOFFS) - 1)]
+                await asyncio.sleep(backoff * (0.5 + random.random()))
         
         raise Exception("Max retry attempts reached")
     
@@ -170,68 +283,95 @@ class TauseStackAgent:
             'agent_id': self.config.agent_id
         }
         
-        # Llamar al AI Service a través del API Gateway
-        timeout = httpx.Timeout(self.config.timeout_seconds)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            
-            # Determinar endpoint según el modelo
-            if model_config['model'].startswith('gpt'):
-                endpoint = f"{self.api_base_url}/ai/openai/completion"
-            elif model_config['model'].startswith('claude'):
-                endpoint = f"{self.api_base_url}/ai/claude/completion"
-            else:
-                endpoint = f"{self.api_base_url}/ai/completion"
-            
-            response = await client.post(endpoint, json=payload)
-            
-            if response.status_code != 200:
-                raise Exception(f"AI Service error: {response.status_code} - {response.text}")
-            
-            return response.json()
+        # Llamar al AI Service a través del API Gateway (timeout por llamada: puede cambiar con la config)
+        response = await self._http_client().post(
+            self._endpoint,
+            content=orjson.dumps(payload),
+            headers=_JSON_HEADERS,
+            timeout=self.config.timeout_seconds
+        )
+        
+        if response.status_code != 200:
+            raise AIServiceError(response.status_code, response.text)
+        
+        return response.json()
+    
+    def _get_model_config(self) -> Dict[str, Any]:
+        """Configuración del modelo, calculada una vez por versión de la config"""
+        if self._model_config_cache is None:
+            self._model_config_cache = self.config.get_model_config()
+        return self._model_config_cache
+    
+    def _resolve_endpoint(self) -> str:
+        """Determinar endpoint del AI Service según el modelo configurado"""
+        return _endpoint_for(self.api_base_url, self._get_model_config()['model'])
     
     def _build_prompt(self, task: str, context: Dict[str, Any]) -> str:
         """Construir prompt completo para el AI Service"""
         
-        prompt_parts = [
-            f"INSTRUCTIONS:\n{context['agent_instructions']}\n",
-            f"TASK:\n{task}\n"
-        ]
+        # Encabezados constantes intercalados con el contenido; un solo join al final
+        parts = ["INSTRUCTIONS:\n", context['agent_instructions'], "\n\nTASK:\n", task, "\n\n"]
         
         # Agregar contexto de memoria si existe
         if context.get('memory_context'):
-            prompt_parts.append(f"RELEVANT CONTEXT:\n{context['memory_context']}\n")
+            parts += ("RELEVANT CONTEXT:\n", context['memory_context'], "\n\n")
         
         # Agregar contexto del usuario
         if context.get('user_context'):
-            prompt_parts.append(f"ADDITIONAL CONTEXT:\n{json.dumps(context['user_context'], indent=2)}\n")
+            user_context = orjson.dumps(context['user_context'], option=_PROMPT_JSON_OPTIONS).decode()
+            parts += ("ADDITIONAL CONTEXT:\n", user_context, "\n\n")
         
         # Agregar herramientas disponibles
         if context.get('available_tools'):
-            tools_list = "\n".join([f"- {tool}" for tool in context['available_tools']])
-            prompt_parts.append(f"AVAILABLE TOOLS:\n{tools_list}\n")
+            parts += ("AVAILABLE TOOLS:\n- ", "\n- ".join(context['available_tools']), "\n\n")
         
-        prompt_parts.append("RESPONSE:")
+        parts.append("RESPONSE:")
         
-        return "\n".join(prompt_parts)
+        return "".join(parts)
     
     async def get_status(self) -> Dict[str, Any]:
-        """Obtener estado actual del agente"""
-        return {
+        """Obtener estado actual del agente (cacheado durante _STATUS_CACHE_TTL)"""
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is not None and now - cached[0] < _STATUS_CACHE_TTL:
+            return cached[1]
+        
+        memory_size, last_activity = await asyncio.gather(
+            self.memory.get_size(),
+            self.memory.get_last_activity()
+        )
+        
+        status = {
             'agent_id': self.config.agent_id,
             'name': self.config.name,
             'tenant_id': self.config.tenant_id,
             'role': self.config.role.name,
             'enabled': self.config.enabled,
             'is_busy': self.is_busy,
-            'current_task_id': self.current_task_id,
-            'stats': self.stats,
-            'memory_size': await self.memory.get_size(),
-            'last_activity': await self.memory.get_last_activity()
+            'current_task_id': next(iter(self._inflight), None),
+            'inflight_task_ids': list(self._inflight),
+            'stats': self.stats.asdict(),
+            'memory_size': memory_size,
+            'last_activity': last_activity
         }
+        self._status_cache = (now, status)
+        return status
+    
+    def invalidate_status_cache(self):
+        """Descartar el estado cacheado (tras cambios de tarea, configuración o memoria)"""
+        self._status_cache = None
     
     async def update_config(self, **kwargs):
         """Actualizar configuración del agente"""
         self.config.update_config(**kwargs)
+        self.invalidate_status_cache()
+        self._model_config_cache = None
+        self._endpoint = self._resolve_endpoint()
+        
+        # Un límite mayor admite de inmediato a las tareas en espera
+        if 'max_concurrent_tasks' in kwargs and self._slots is not None:
+            async with self._slots:
+                self._slots.notify_all()
         
         # Actualizar herramientas si cambiaron
         if 'allowed_tools' in kwargs or 'restricted_tools' in kwargs:
@@ -243,6 +383,7 @@ class TauseStackAgent:
     async def clear_memory(self):
         """Limpiar memoria del agente"""
         await self.memory.clear()
+        self.invalidate_status_cache()
     
     async def get_memory_summary(self) -> Dict[str, Any]:
         """Obtener resumen de la memoria"""
@@ -251,6 +392,23 @@ class TauseStackAgent:
     def get_config(self) -> AgentConfig:
         """Obtener configuración actual"""
         return self.config
+    
+    def _http_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP del agente, creado en el primer uso"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.config.timeout_seconds),
+                limits=_HTTP_LIMITS
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Esperar escrituras de memoria pendientes y cerrar el cliente HTTP del agente"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
 
 
 class TauseStackAgentManager:
@@ -259,41 +417,72 @@ class TauseStackAgentManager:
     def __init__(
         self, 
         api_base_url: str = "http://localhost:9001",
-        storage_path: str = ".tausestack_storage"
+        storage_path: Union[str, Path] = ".tausestack_storage"
     ):
         self.api_base_url = api_base_url
-        self.storage_path = storage_path
+        self.storage_path = Path(storage_path)
+        # Directorios de memoria por tenant, creados una sola vez
+        self._tenant_dirs: Dict[str, Path] = {}
         self.agents: Dict[str, TauseStackAgent] = {}
+        # Índice secundario tenant_id -> agent_ids
+        self._by_tenant: Dict[str, Set[str]] = defaultdict(set)
+        # Cierres en curso de agentes reemplazados (se esperan en aclose)
+        self._closing: Set[asyncio.Task] = set()
     
     def create_agent(self, config: AgentConfig) -> TauseStackAgent:
         """Crear nuevo agente"""
         agent = TauseStackAgent(
             config=config,
             api_base_url=self.api_base_url,
-            storage_path=self.storage_path
+            storage_path=self.storage_path,
+            tenant_dir=self._tenant_dir(config.tenant_id)
         )
         
+        previous = self.agents.get(config.agent_id)
+        if previous is not None:
+            self._unindex(previous)
+            self._close_later(previous)
         self.agents[config.agent_id] = agent
+        self._by_tenant[config.tenant_id].add(config.agent_id)
         return agent
     
+    def _tenant_dir(self, tenant_id: str) -> Path:
+        """Directorio de memoria del tenant (memoizado)"""
+        tenant_dir = self._tenant_dirs.get(tenant_id)
+        if tenant_dir is None:
+            tenant_dir = self.storage_path / "agents" / tenant_id
+            tenant_dir.mkdir(parents=True, exist_ok=True)
+            self._tenant_dirs[tenant_id] = tenant_dir
+        return tenant_dir
+    
+    def _unindex(self, agent: TauseStackAgent):
+        """Quitar agente del índice por tenant"""
+        agent_ids = self._by_tenant.get(agent.config.tenant_id)
+        if agent_ids is not None:
+            agent_ids.discard(agent.config.agent_id)
+            if not agent_ids:
+                del self._by_tenant[agent.config.tenant_id]
+    
+    def _close_later(self, agent: TauseStackAgent):
+        """Cerrar en segundo plano un agente reemplazado (solo ha podido abrir conexiones dentro del loop)"""
+        try:
+            closing = asyncio.get_running_loop().create_task(agent.aclose())
+        except RuntimeError:
+            return
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+    
     def get_agent(self, agent_id: str) -> Optional[TauseStackAgent]:
         """Obtener agente por ID"""
         return self.agents.get(agent_id)
     
     def get_agents_by_tenant(self, tenant_id: str) -> List[TauseStackAgent]:
         """Obtener agentes por tenant"""
-        return [
-            agent for agent in self.agents.values() 
-            if agent.config.tenant_id == tenant_id
-        ]
+        return [self.agents[agent_id] for agent_id in self._by_tenant.get(tenant_id, ())]
     
     async def get_all_statuses(self) -> List[Dict[str, Any]]:
         """Obtener estado de todos los agentes"""
-        statuses = []
-        for agent in self.agents.values():
-            status = await agent.get_status()
-            statuses.append(status)
-        return statuses
+        return list(await asyncio.gather(*(agent.get_status() for agent in self.agents.values())))
     
     async def execute_task(
         self, 
@@ -311,9 +500,18 @@ class TauseStackAgentManager:
         
         return await agent.execute_task(task, context)
     
-    def remove_agent(self, agent_id: str) -> bool:
-        """Eliminar agente"""
-        if agent_id in self.agents:
-            del self.agents[agent_id]
-            return True
-        return False 
\ No newline at end of file
+    async def remove_agent(self, agent_id: str) -> bool:
+        """Eliminar agente y cerrar sus conexiones"""
+        agent = self.agents.pop(agent_id, None)
+        if agent is None:
+            return False
+        self._unindex(agent)
+        await agent.aclose()
+        return True
+    
+    async def aclose(self):
+        """Cerrar todos los agentes: espera sus escrituras de memoria pendientes y cierra sus clientes HTTP"""
+        await asyncio.gather(
+            *(agent.aclose() for agent in self.agents.values()),
+            *self._closing
+        ) 
\ No newline at end of file
@@ -4,7 +4,7 @@ Agent Memory - Memoria persistente para agentes multi-tenant
 
 import json
 import aiofiles
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -18,14 +18,17 @@ class AgentMemory:
         self, 
         agent_id: str, 
         tenant_id: str, 
-        storage_path: str = ".tausestack_storage"
+        storage_path: Union[str, Path] = ".tausestack_storage",
+        tenant_dir: Optional[Path] = None
     ):
         self.agent_id = agent_id
         self.tenant_id = tenant_id
         self.storage_path = Path(storage_path)
         
-        # Crear directorio específico para el agente
-        self.agent_memory_dir = self.storage_path / "agents" / tenant_id / agent_id
+        # Crear directorio específico para el agente (tenant_dir: ya creado por el manager)
+        if tenant_dir is None:
+            tenant_dir = self.storage_path / "agents" / tenant_id
+        self.agent_memory_dir = tenant_dir / agent_id
         self.agent_memory_dir.mkdir(parents=True, exist_ok=True)
         
         # Archivos de memoria
@@ -7,27 +7,56 @@ Complementa al Agent API individual con funcionalidad de equipos.
 """
 
 import asyncio
-import json
+import os
+import re
+import secrets
 import uuid
+from collections import defaultdict, deque
+from itertools import islice
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Literal
 
 import aiofiles
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel, Field
 
 # Importar componentes de Agent Engine
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-
 from tausestack.services.agent_engine.core.agent_team import AgentTeam, TeamType, PresetTeams
 from tausestack.services.agent_engine.core.tausestack_agent import TauseStackAgent, TauseStackAgentManager
 
 
+# Número de ejecuciones conservadas al compactar el historial
+_EXECUTION_HISTORY_LIMIT = 200
+
+# Líneas en disco a partir de las cuales el JSONL de ejecuciones se compacta
+_EXECUTION_HISTORY_ROTATE_AT = 2 * _EXECUTION_HISTORY_LIMIT
+
+# Espera antes de escribir, para agrupar en un lote las ejecuciones que terminan juntas (segundos)
+_EXECUTION_FLUSH_DELAY = 0.05
+
+# Contadores de AgentTeam.stats expuestos en TeamStatusModel
+_TEAM_STATS_FIELDS = ('workflows_completed', 'workflows_failed', 'total_execution_time_ms', 'total_tokens_used')
+
+# Workflows de equipo ejecutándose a la vez; por encima se rechazan (503) salvo prioridad alta
+_MAX_CONCURRENT_WORKFLOWS = int(os.getenv("TAUSESTACK_MAX_CONCURRENT_WORKFLOWS", "8"))
+
+# Caracteres no permitidos en el slug del team_id (se reemplazan por guiones)
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Documentación interactiva y esquema OpenAPI solo fuera de producción
+_DOCS_ENABLED = os.getenv("ENVIRONMENT", "development") != "production"
+
+# Tipos de registro del JSONL de equipos
+_TEAM_UPDATE = "team_update"
+_TEAM_DELETE = "team_delete"
+
+
 # ========================= MODELS =========================
 
 class TeamStatusModel(BaseModel):
@@ -78,7 +107,11 @@ class AgentTeamAPIService:
         self.app = FastAPI(
             title="TauseStack Agent Team API",
             description="API para gestión de equipos de agentes con workflows",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse,
+            docs_url="/docs" if _DOCS_ENABLED else None,
+            redoc_url="/redoc" if _DOCS_ENABLED else None,
+            openapi_url="/openapi.json" if _DOCS_ENABLED else None
         )
         
         self.security = HTTPBearer()
@@ -92,42 +125,90 @@ class AgentTeamAPIService:
         # Storage para equipos
         self.data_dir = Path(".tausestack_storage/teams")
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.teams_file = self.data_dir / "team_configs.json"
-        self.executions_file = self.data_dir / "team_executions.json"
+        # JSON Lines de solo anexar: un registro por cambio de equipo / por ejecución terminada
+        self.teams_file = self.data_dir / "team_configs.jsonl"
+        self.executions_file = self.data_dir / "team_executions.jsonl"
+        # Formato anterior (lista JSON completa), solo se lee para migrar
+        self.legacy_teams_file = self.data_dir / "team_configs.json"
+        self.legacy_executions_file = self.data_dir / "team_executions.json"
         
         # Estado en memoria
         self.active_teams: Dict[str, AgentTeam] = {}
-        self.execution_queue: List[TeamExecutionResponse] = []
-        self.execution_history: List[TeamExecutionResponse] = []
+        # Ejecuciones en curso indexadas por execution_id
+        self.execution_queue: Dict[str, TeamExecutionResponse] = {}
+        self.execution_history: Deque[TeamExecutionResponse] = deque(maxlen=_EXECUTION_HISTORY_LIMIT)
+        # Índices del historial: por execution_id y por team_id (en orden cronológico)
+        self.execution_index: Dict[str, TeamExecutionResponse] = {}
+        self.team_executions_idx: Dict[str, Deque[TeamExecutionResponse]] = defaultdict(deque)
+        # Versión del historial: invalida las respuestas cacheadas de list_executions
+        self._history_version = 0
+        self._executions_payload = lru_cache(maxsize=128)(self._serialize_executions)
+        # TeamStatusModel por team_id; se descarta cuando el equipo cambia
+        self._status_cache: Dict[str, TeamStatusModel] = {}
+        # JSON ya serializado de cada estado, para componer list_teams sin pasar por Pydantic
+        self._status_json_cache: Dict[str, bytes] = {}
+        
+        # Último registro vigente por team_id (incluye equipos cuyos agentes no están cargados)
+        self._team_records: Dict[str, Dict[str, Any]] = {}
+        # Líneas ya escritas en el JSONL de ejecuciones y lock de escritura
+        # (el lock se crea dentro del event loop: en Python 3.9 queda ligado al loop de su creación)
+        self._execution_lines = 0
+        self._executions_lock: Optional[asyncio.Lock] = None
+        # Cupos de ejecución de workflows (creado dentro del event loop, como el lock)
+        self._workflow_sem: Optional[asyncio.Semaphore] = None
+        # Ejecuciones terminadas pendientes de escribir y la tarea que las escribe por lotes
+        self._save_queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
         
         # Configurar eventos
         self.app.add_event_handler("startup", self._load_teams)
+        self.app.add_event_handler("shutdown", self._stop_execution_flusher)
+        self.app.add_event_handler("shutdown", self._close_agents)
         
         # Configurar rutas
         self._setup_routes()
     
+    async def _read_jsonl(self, path: Path, legacy_path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Leer registros JSONL; si no existe, leer la lista JSON del formato anterior"""
+        if path.exists():
+            async with aiofiles.open(path, 'rb') as f:
+                content = await f.read()
+            return [orjson.loads(line) for line in content.splitlines() if line]
+        if legacy_path.exists():
+            async with aiofiles.open(legacy_path, 'rb') as f:
+                return orjson.loads(await f.read())
+        return None
+    
     async def _load_teams(self):
         """Cargar equipos guardados al iniciar"""
         try:
-            if self.teams_file.exists():
-                async with aiofiles.open(self.teams_file, 'r') as f:
-                    content = await f.read()
-                    teams_data = json.loads(content)
-                    
-                    for team_data in teams_data:
-                        await self._recreate_team_from_data(team_data)
+            team_records = await self._read_jsonl(self.teams_file, self.legacy_teams_file)
+            if team_records is not None:
+                # Quedarse con el último registro por equipo; las bajas eliminan el equipo
+                for record in team_records:
+                    if record.pop('type', _TEAM_UPDATE) == _TEAM_DELETE:
+                        self._team_records.pop(record['team_id'], None)
+                    else:
+                        self._team_records[record['team_id']] = record
+                
+                for team_data in self._team_records.values():
+                    await self._recreate_team_from_data(team_data)
+                
+                # Compactar: una línea por equipo vigente
+                await self._write_lines(
+                    self.teams_file,
+                    'wb',
+                    [self._team_line(record) for record in self._team_records.values()]
+                )
             
             # Cargar historial de ejecuciones
-            if self.executions_file.exists():
-                async with aiofiles.open(self.executions_file, 'r') as f:
-                    content = await f.read()
-                    executions_data = json.loads(content)
-                    
-                    for exec_data in executions_data:
-                        exec_data['start_time'] = datetime.fromisoformat(exec_data['start_time'])
-                        if exec_data.get('end_time'):
-                            exec_data['end_time'] = datetime.fromisoformat(exec_data['end_time'])
-                        self.execution_history.append(TeamExecutionResponse(**exec_data))
+            executions_data = await self._read_jsonl(self.executions_file, self.legacy_executions_file)
+            if executions_data is not None:
+                for exec_data in executions_data:
+                    self._add_to_history(self._materialize_execution(exec_data))
+                
+                # Compactar al arrancar (también migra el formato anterior)
+                await self._compact_executions()
                         
         except Exception as e:
             print(f"Error loading teams: {e}")
@@ -136,10 +217,8 @@ class AgentTeamAPIService:
         """Recrear un equipo desde datos guardados"""
         try:
             # Obtener agentes desde el agent manager
-            agents = []
-            for agent_id in team_data.get('agent_ids', []):
-                if agent_id in self.agent_manager.agents:
-                    agents.append(self.agent_manager.agents[agent_id])
+            registry = self.agent_manager.agents
+            agents = [registry[a] for a in team_data.get('agent_ids', []) if a in registry]
             
             if not agents:
                 print(f"No agents found for team {team_data.get('team_id')}")
@@ -164,49 +243,200 @@ class AgentTeamAPIService:
         except Exception as e:
             print(f"Error recreating team {team_data.get('team_id', 'unknown')}: {e}")
     
-    async def _save_teams(self):
-        """Guardar configuraciones de equipos"""
+    @staticmethod
+    def _team_line(record: Dict[str, Any], record_type: str = _TEAM_UPDATE) -> bytes:
+        """Serializar un registro del JSONL de equipos"""
+        return orjson.dumps({'type': record_type, **record})
+    
+    @staticmethod
+    async def _write_lines(path: Path, mode: str, lines: List[bytes]):
+        """Escribir líneas JSONL ('ab' anexa, 'wb' reescribe)"""
+        async with aiofiles.open(path, mode) as f:
+            await f.write(b"".join(line + b"\n" for line in lines))
+    
+    async def _save_team(self, team: AgentTeam):
+        """Anexar una instantánea de la configuración del equipo"""
         try:
-            teams_data = []
-            for team_id, team in self.active_teams.items():
-                team_data = {
-                    'team_id': team.team_id,
-                    'name': team.name,
-                    'tenant_id': team.tenant_id,
-                    'team_type': team.team_type.value,
-                    'description': team.description,
-                    'agent_ids': list(team.agents.keys()),
-                    'stats': team.stats,
-                    'created_at': datetime.now().isoformat()
-                }
-                teams_data.append(team_data)
-            
-            async with aiofiles.open(self.teams_file, 'w') as f:
-                await f.write(json.dumps(teams_data, indent=2))
+            previous = self._team_records.get(team.team_id)
+            record = {
+                'team_id': team.team_id,
+                'name': team.name,
+                'tenant_id': team.tenant_id,
+                'team_type': team.team_type.value,
+                'description': team.description,
+                'agent_ids': list(team.agents.keys()),
+                'stats': team.stats,
+                'created_at': previous['created_at'] if previous else datetime.now().isoformat()
+            }
+            self._team_records[team.team_id] = record
+            await self._write_lines(self.teams_file, 'ab', [self._team_line(record)])
                 
         except Exception as e:
             print(f"Error saving teams: {e}")
     
-    async def _save_executions(self):
-        """Guardar historial de ejecuciones"""
+    async def _save_team_deletion(self, team_id: str):
+        """Anexar la baja de un equipo"""
         try:
-            # Mantener solo las últimas 200 ejecuciones
-            recent_history = self.execution_history[-200:]
-            
-            executions_data = []
-            for execution in recent_history:
-                exec_dict = execution.dict()
-                exec_dict['start_time'] = exec_dict['start_time'].isoformat()
-                if exec_dict.get('end_time'):
-                    exec_dict['end_time'] = exec_dict['end_time'].isoformat()
-                executions_data.append(exec_dict)
-            
-            async with aiofiles.open(self.executions_file, 'w') as f:
-                await f.write(json.dumps(executions_data, indent=2))
+            self._team_records.pop(team_id, None)
+            await self._write_lines(self.teams_file, 'ab', [self._team_line({'team_id': team_id}, _TEAM_DELETE)])
+                
+        except Exception as e:
+            print(f"Error saving teams: {e}")
+    
+    @staticmethod
+    def _execution_line(execution: TeamExecutionResponse) -> bytes:
+        """Serializar una ejecución (orjson escribe datetime en ISO 8601)"""
+        return orjson.dumps(execution.model_dump())
+    
+    def _workflow_slots(self) -> asyncio.Semaphore:
+        """Semáforo que acota los workflows en ejecución"""
+        if self._workflow_sem is None:
+            self._workflow_sem = asyncio.Semaphore(_MAX_CONCURRENT_WORKFLOWS)
+        return self._workflow_sem
+    
+    def _executions_write_lock(self) -> asyncio.Lock:
+        """Lock de escritura del JSONL de ejecuciones"""
+        if self._executions_lock is None:
+            self._executions_lock = asyncio.Lock()
+        return self._executions_lock
+    
+    async def _compact_executions(self):
+        """Reescribir el JSONL de ejecuciones con las últimas 200"""
+        async with self._executions_write_lock():
+            lines = [self._execution_line(e) for e in self.execution_history]
+            await self._write_lines(self.executions_file, 'wb', lines)
+            self._execution_lines = len(lines)
+    
+    async def _save_executions(self, executions: List[TeamExecutionResponse]):
+        """Anexar un lote de ejecuciones terminadas; compactar cuando el archivo crece demasiado"""
+        try:
+            if self._execution_lines + len(executions) > _EXECUTION_HISTORY_ROTATE_AT:
+                await self._compact_executions()
+                return
+            
+            async with self._executions_write_lock():
+                await self._write_lines(self.executions_file, 'ab', [self._execution_line(e) for e in executions])
+                self._execution_lines += len(executions)
                 
         except Exception as e:
             print(f"Error saving executions: {e}")
     
+    def _queue_execution_save(self, execution: TeamExecutionResponse):
+        """Encolar una ejecución terminada; el flusher se arranca con la primera"""
+        if self._save_queue is None:
+            self._save_queue = asyncio.Queue()
+            self._flusher_task = asyncio.create_task(self._flush_executions(self._save_queue))
+        self._save_queue.put_nowait(execution)
+    
+    async def _flush_executions(self, queue: asyncio.Queue):
+        """Escribir por lotes las ejecuciones encoladas hasta recibir None"""
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(_EXECUTION_FLUSH_DELAY)
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            executions = [e for e in batch if e is not None]
+            if executions:
+                await self._save_executions(executions)
+            if len(executions) != len(batch):
+                return
+    
+    async def _stop_execution_flusher(self):
+        """Escribir lo pendiente y detener el flusher al apagar el servicio"""
+        if self._flusher_task is None:
+            return
+        self._save_queue.put_nowait(None)
+        await self._flusher_task
+        self._save_queue = None
+        self._flusher_task = None
+    
+    async def _close_team_agents(self, team: AgentTeam):
+        """Cerrar los agentes propios del equipo (los del agent manager los cierra el manager)"""
+        registry = self.agent_manager.agents
+        await asyncio.gather(*(
+            agent.aclose() for agent_id, agent in team.agents.items()
+            if registry.get(agent_id) is not agent
+        ))
+    
+    async def _close_agents(self):
+        """Cerrar los agentes de todos los equipos y del agent manager al apagar el servicio"""
+        await asyncio.gather(*(self._close_team_agents(team) for team in self.active_teams.values()))
+        await self.agent_manager.aclose()
+    
+    def _add_to_history(self, execution: TeamExecutionResponse):
+        """Agregar ejecución al historial acotado, manteniendo sus índices sincronizados"""
+        if len(self.execution_history) == self.execution_history.maxlen:
+            # La ejecución desalojada es la más antigua, también dentro de su equipo
+            evicted = self.execution_history[0]
+            self.execution_index.pop(evicted.execution_id, None)
+            team_history = self.team_executions_idx[evicted.team_id]
+            team_history.popleft()
+            if not team_history:
+                del self.team_executions_idx[evicted.team_id]
+        self.execution_history.append(execution)
+        self.execution_index[execution.execution_id] = execution
+        self.team_executions_idx[execution.team_id].append(execution)
+        self._history_version += 1
+    
+    @staticmethod
+    def _materialize_execution(exec_data: Dict[str, Any]) -> TeamExecutionResponse:
+        """Reconstruir una ejecución persistida sin validación Pydantic
+        
+        Los registros los escribió este mismo servicio, así que basta con
+        restaurar las fechas y construir el modelo directamente.
+        """
+        exec_data['start_time'] = datetime.fromisoformat(exec_data['start_time'])
+        if exec_data.get('end_time'):
+            exec_data['end_time'] = datetime.fromisoformat(exec_data['end_time'])
+        return TeamExecutionResponse.model_construct(**exec_data)
+    
+    def _select_executions(self, limit: int, team_id: Optional[str]) -> List[TeamExecutionResponse]:
+        """Últimas ejecuciones del historial, opcionalmente filtradas por equipo"""
+        executions = self.team_executions_idx.get(team_id, ()) if team_id else self.execution_history
+        # Misma semántica que el slicing [-limit:] de una lista: limit=0 devuelve todo el historial
+        count = len(executions)
+        start = max(0, count - limit) if limit > 0 else min(count, -limit)
+        return list(islice(executions, start, None))
+    
+    def _serialize_executions(self, limit: int, team_id: Optional[str], version: int) -> bytes:
+        """JSON de list_executions para una versión del historial (cacheado por LRU)"""
+        executions = self._select_executions(limit, team_id)
+        return orjson.dumps([execution.model_dump() for execution in executions])
+    
+    def _status_model(self, team: AgentTeam) -> TeamStatusModel:
+        """TeamStatusModel del equipo, cacheado hasta que cambie su estado"""
+        cached = self._status_cache.get(team.team_id)
+        if cached is not None:
+            return cached
+        
+        # Estado interno confiable: aplanar stats y construir sin validar
+        status = team.get_status()
+        stats = status.pop('stats')
+        model = TeamStatusModel.model_construct(
+            **status,
+            **{key: stats[key] for key in _TEAM_STATS_FIELDS}
+        )
+        self._status_cache[team.team_id] = model
+        return model
+    
+    def _status_json(self, team: AgentTeam) -> bytes:
+        """JSON del estado del equipo, cacheado junto con su TeamStatusModel"""
+        blob = self._status_json_cache.get(team.team_id)
+        if blob is None:
+            blob = orjson.dumps(self._status_model(team).model_dump())
+            self._status_json_cache[team.team_id] = blob
+        return blob
+    
+    def _status_response(self, team: AgentTeam) -> Response:
+        """Respuesta con el JSON cacheado del equipo (response_model queda solo para OpenAPI)"""
+        return Response(content=self._status_json(team), media_type="application/json")
+    
+    def _invalidate_status(self, team_id: str):
+        """Descartar el estado cacheado de un equipo"""
+        self._status_cache.pop(team_id, None)
+        self._status_json_cache.pop(team_id, None)
+    
     def _setup_routes(self):
         """Configurar todas las rutas del API"""
         
@@ -225,38 +455,19 @@ class AgentTeamAPIService:
         @self.app.get("/teams", response_model=List[TeamStatusModel])
         async def list_teams():
             """Listar todos los equipos configurados"""
-            teams_status = []
-            
-            for team_id, team in self.active_teams.items():
-                status = team.get_status()
-                team_status = TeamStatusModel(
-                    team_id=status['team_id'],
-                    name=status['name'],
-                    team_type=status['team_type'],
-                    tenant_id=status['tenant_id'],
-                    is_busy=status['is_busy'],
-                    agent_count=status['agent_count'],
-                    workflow_name=status['workflow_name'],
-                    current_execution=status['current_execution'],
-                    workflows_completed=status['stats']['workflows_completed'],
-                    workflows_failed=status['stats']['workflows_failed'],
-                    total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                    total_tokens_used=status['stats']['total_tokens_used'],
-                    agents=status['agents']
-                )
-                teams_status.append(team_status)
-            
-            return teams_status
+            # Se concatenan los JSON cacheados de cada equipo sin revalidar
+            body = b"[" + b",".join(self._status_json(team) for team in self.active_teams.values()) + b"]"
+            return Response(content=body, media_type="application/json")
         
         @self.app.post("/teams", response_model=TeamStatusModel)
         async def create_team(request: TeamCreateRequest):
             """Crear un nuevo equipo"""
-            # Validar que existan los agentes
-            agents = []
-            for agent_id in request.agent_ids:
-                if agent_id not in self.agent_manager.agents:
-                    raise HTTPException(status_code=400, detail=f"Agent {agent_id} not found")
-                agents.append(self.agent_manager.agents[agent_id])
+            # Validar que existan los agentes (se informan todos los que falten)
+            registry = self.agent_manager.agents
+            missing = [a for a in request.agent_ids if a not in registry]
+            if missing:
+                raise HTTPException(status_code=400, detail=f"Agents not found: {', '.join(missing)}")
+            agents = [registry[a] for a in request.agent_ids]
             
             if not agents:
                 raise HTTPException(status_code=400, detail="At least one agent is required")
@@ -268,7 +479,8 @@ class AgentTeamAPIService:
                 raise HTTPException(status_code=400, detail="Invalid team type")
             
             # Crear equipo
-            team_id = f"{request.name.lower().replace(' ', '-')}-{str(uuid.uuid4())[:8]}"
+            slug = _SLUG_RE.sub("-", request.name.lower()).strip("-") or "team"
+            team_id = f"{slug}-{secrets.token_hex(4)}"
             
             team = AgentTeam(
                 team_id=team_id,
@@ -281,25 +493,10 @@ class AgentTeamAPIService:
             
             # Registrar
             self.active_teams[team_id] = team
-            await self._save_teams()
+            await self._save_team(team)
             
             # Retornar status
-            status = team.get_status()
-            return TeamStatusModel(
-                team_id=status['team_id'],
-                name=status['name'],
-                team_type=status['team_type'],
-                tenant_id=status['tenant_id'],
-                is_busy=status['is_busy'],
-                agent_count=status['agent_count'],
-                workflow_name=status['workflow_name'],
-                current_execution=status['current_execution'],
-                workflows_completed=status['stats']['workflows_completed'],
-                workflows_failed=status['stats']['workflows_failed'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                agents=status['agents']
-            )
+            return self._status_response(team)
         
         @self.app.get("/teams/{team_id}", response_model=TeamStatusModel)
         async def get_team(team_id: str):
@@ -307,24 +504,7 @@ class AgentTeamAPIService:
             if team_id not in self.active_teams:
                 raise HTTPException(status_code=404, detail="Team not found")
             
-            team = self.active_teams[team_id]
-            status = team.get_status()
-            
-            return TeamStatusModel(
-                team_id=status['team_id'],
-                name=status['name'],
-                team_type=status['team_type'],
-                tenant_id=status['tenant_id'],
-                is_busy=status['is_busy'],
-                agent_count=status['agent_count'],
-                workflow_name=status['workflow_name'],
-                current_execution=status['current_execution'],
-                workflows_completed=status['stats']['workflows_completed'],
-                workflows_failed=status['stats']['workflows_failed'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                agents=status['agents']
-            )
+            return self._status_response(self.active_teams[team_id])
         
         @self.app.delete("/teams/{team_id}")
         async def delete_team(team_id: str):
@@ -332,8 +512,12 @@ class AgentTeamAPIService:
             if team_id not in self.active_teams:
                 raise HTTPException(status_code=404, detail="Team not found")
             
-            del self.active_teams[team_id]
-            await self._save_teams()
+            team = self.active_teams.pop(team_id)
+            self._invalidate_status(team_id)
+            await self._save_team_deletion(team_id)
+            # Con un workflow en curso, los agentes se cierran cuando termine
+            if not team.is_busy:
+                await self._close_team_agents(team)
             
             return {"message": f"Team {team_id} deleted successfully"}
         
@@ -348,8 +532,12 @@ class AgentTeamAPIService:
             if team.is_busy:
                 raise HTTPException(status_code=400, detail="Team is busy")
             
+            # Admisión: sin cupos libres solo se encolan las ejecuciones de prioridad alta
+            if self._workflow_slots().locked() and request.priority != "high":
+                raise HTTPException(status_code=503, detail="Too many workflows running, retry later")
+            
             # Crear respuesta de ejecución
-            execution_id = str(uuid.uuid4())
+            execution_id = uuid.uuid4().hex
             execution_response = TeamExecutionResponse(
                 execution_id=execution_id,
                 team_id=team_id,
@@ -358,7 +546,7 @@ class AgentTeamAPIService:
                 start_time=datetime.now()
             )
             
-            self.execution_queue.append(execution_response)
+            self.execution_queue[execution_id] = execution_response
             
             # Ejecutar en background
             background_tasks.add_task(
@@ -370,76 +558,56 @@ class AgentTeamAPIService:
             
             return execution_response
         
-        @self.app.get("/teams/preset/research")
+        @self.app.get("/teams/preset/research", response_model=TeamStatusModel)
         async def create_preset_research_team(tenant_id: str = "default"):
             """Crear un equipo de investigación predefinido"""
             team = await PresetTeams.create_research_team(tenant_id)
             self.active_teams[team.team_id] = team
-            await self._save_teams()
-            
-            status = team.get_status()
-            return TeamStatusModel(
-                team_id=status['team_id'],
-                name=status['name'],
-                team_type=status['team_type'],
-                tenant_id=status['tenant_id'],
-                is_busy=status['is_busy'],
-                agent_count=status['agent_count'],
-                workflow_name=status['workflow_name'],
-                current_execution=status['current_execution'],
-                workflows_completed=status['stats']['workflows_completed'],
-                workflows_failed=status['stats']['workflows_failed'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                agents=status['agents']
-            )
+            await self._save_team(team)
+            
+            return self._status_response(team)
         
-        @self.app.get("/teams/preset/content")
+        @self.app.get("/teams/preset/content", response_model=TeamStatusModel)
         async def create_preset_content_team(tenant_id: str = "default"):
             """Crear un equipo de contenido predefinido"""
             team = await PresetTeams.create_content_team(tenant_id)
             self.active_teams[team.team_id] = team
-            await self._save_teams()
-            
-            status = team.get_status()
-            return TeamStatusModel(
-                team_id=status['team_id'],
-                name=status['name'],
-                team_type=status['team_type'],
-                tenant_id=status['tenant_id'],
-                is_busy=status['is_busy'],
-                agent_count=status['agent_count'],
-                workflow_name=status['workflow_name'],
-                current_execution=status['current_execution'],
-                workflows_completed=status['stats']['workflows_completed'],
-                workflows_failed=status['stats']['workflows_failed'],
-                total_execution_time_ms=status['stats']['total_execution_time_ms'],
-                total_tokens_used=status['stats']['total_tokens_used'],
-                agents=status['agents']
-            )
+            await self._save_team(team)
+            
+            return self._status_response(team)
         
         @self.app.get("/executions", response_model=List[TeamExecutionResponse])
-        async def list_executions(limit: int = 50, team_id: Optional[str] = None):
-            """Listar historial de ejecuciones de workflows"""
-            executions = self.execution_history[-limit:]
-            
-            if team_id:
-                executions = [e for e in executions if e.team_id == team_id]
+        async def list_executions(
+            limit: int = 50,
+            team_id: Optional[str] = None,
+            format: Literal["json", "ndjson"] = "json"
+        ):
+            """Listar historial de ejecuciones de workflows
+            
+            Con ``format=ndjson`` se emite una ejecución por línea en streaming,
+            sin materializar la respuesta completa en memoria.
+            """
+            if format == "ndjson":
+                # La selección es una copia: no le afectan las ejecuciones que terminen mientras se emite
+                executions = self._select_executions(limit, team_id)
+                
+                def stream_lines():
+                    for execution in executions:
+                        yield orjson.dumps(execution.model_dump()) + b"\n"
+                
+                return StreamingResponse(stream_lines(), media_type="application/x-ndjson")
             
-            return executions
+            # Las ejecuciones del historial ya no cambian: se sirve el JSON cacheado sin revalidar
+            payload = self._executions_payload(limit, team_id, self._history_version)
+            return Response(content=payload, media_type="application/json")
         
         @self.app.get("/executions/{execution_id}", response_model=TeamExecutionResponse)
         async def get_execution(execution_id: str):
             """Obtener información de una ejecución específica"""
-            # Buscar en queue primero
-            for execution in self.execution_queue:
-                if execution.execution_id == execution_id:
-                    return execution
-            
-            # Buscar en historial
-            for execution in self.execution_history:
-                if execution.execution_id == execution_id:
-                    return execution
+            # Buscar en queue primero, luego en historial
+            execution = self.execution_queue.get(execution_id) or self.execution_index.get(execution_id)
+            if execution is not None:
+                return execution
             
             raise HTTPException(status_code=404, detail="Execution not found")
     
@@ -449,7 +617,23 @@ class AgentTeamAPIService:
         team: AgentTeam,
         request: TeamWorkflowRequest
     ):
-        """Ejecutar workflow en background"""
+        """Ejecutar workflow en background, dentro de un cupo del semáforo"""
+        async with self._workflow_slots():
+            await self._run_workflow(execution_response, team, request)
+        
+        # El equipo se eliminó durante el workflow: liberar ahora sus agentes
+        if self.active_teams.get(team.team_id) is not team:
+            await self._close_team_agents(team)
+    
+    async def _run_workflow(
+        self,
+        execution_response: TeamExecutionResponse,
+        team: AgentTeam,
+        request: TeamWorkflowRequest
+    ):
+        """Ejecutar workflow y mover la ejecución al historial"""
+        # is_busy/current_execution cambian al arrancar el workflow
+        self._invalidate_status(team.team_id)
         try:
             # Ejecutar workflow del equipo
             result = await team.execute_workflow(request.task, request.context)
@@ -463,22 +647,24 @@ class AgentTeamAPIService:
             execution_response.final_result = result['final_result']
             
             # Mover de queue a historial
-            if execution_response in self.execution_queue:
-                self.execution_queue.remove(execution_response)
-            self.execution_history.append(execution_response)
+            self.execution_queue.pop(execution_response.execution_id, None)
+            self._add_to_history(execution_response)
+            # Estadísticas y estado del equipo cambiaron al terminar
+            self._invalidate_status(team.team_id)
             
-            await self._save_executions()
+            self._queue_execution_save(execution_response)
             
         except Exception as e:
             execution_response.status = "failed"
             execution_response.error = str(e)
             execution_response.end_time = datetime.now()
             
-            if execution_response in self.execution_queue:
-                self.execution_queue.remove(execution_response)
-            self.execution_history.append(execution_response)
+            self.execution_queue.pop(execution_response.execution_id, None)
+            self._add_to_history(execution_response)
+            # Estadísticas y estado del equipo cambiaron al terminar
+            self._invalidate_status(team.team_id)
             
-            await self._save_executions()
+            self._queue_execution_save(execution_response)
 
 
 # ========================= STARTUP =========================
@@ -492,4 +678,14 @@ def create_agent_team_api_app():
 app = create_agent_team_api_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8007, log_level="info") 
\ No newline at end of file
+    # Un solo worker: equipos, colas e historial viven en memoria de este proceso.
+    # uvloop y httptools vienen con uvicorn[standard]
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8007,
+        log_level="warning",
+        access_log=False,
+        loop="uvloop",
+        http="httptools"
+    ) 
\ No newline at end of file
@@ -8,6 +8,8 @@ import json
 import logging
 from dataclasses import dataclass
 
+import httpx
+
 try:
     import anthropic
     from anthropic import AsyncAnthropic
@@ -35,7 +37,7 @@ class ClaudeResponse:
 class ClaudeClient:
     """Cliente para integración con Anthropic Claude"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         if not anthropic:
             raise ImportError("anthropic package not installed. Run: pip install anthropic")
         
@@ -43,7 +45,8 @@ class ClaudeClient:
         if not self.api_key:
             raise ValueError("Anthropic API key not provided")
         
-        self.client = AsyncAnthropic(api_key=self.api_key)
+        # http_client compartido por la app: reutiliza conexiones al proveedor entre requests
+        self.client = AsyncAnthropic(api_key=self.api_key, http_client=http_client)
         self.model_costs = {
             "claude-3-opus-20240229": {"input": 0.015, "output": 0.075},  # per 1K tokens
             "claude-3-sonnet-20240229": {"input": 0.003, "output": 0.015},
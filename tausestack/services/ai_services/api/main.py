@@ -1,24 +1,27 @@
 """
 AI Services API - Microservicio de integración con IA para TauseStack v0.9.0
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any, Union
 import asyncio
-import json
 import logging
+import os
 from datetime import datetime
 import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+import orjson
 
 try:
     from ..core.code_generator import (
         CodeGenerator, 
         GenerationRequest, 
         GenerationResult, 
-        GenerationStrategy,
-        get_code_generator
+        GenerationStrategy
     )
     from ..core.prompt_engine import PromptType, AIProvider
 except ImportError:
@@ -30,8 +33,7 @@ except ImportError:
         CodeGenerator, 
         GenerationRequest, 
         GenerationResult, 
-        GenerationStrategy,
-        get_code_generator
+        GenerationStrategy
     )
     from core.prompt_engine import PromptType, AIProvider
 
@@ -40,13 +42,44 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Documentación interactiva y esquema OpenAPI solo fuera de producción
+_DOCS_ENABLED = os.getenv("ENVIRONMENT", "development") != "production"
+
+# Pool de conexiones compartido con los SDK de OpenAI y Anthropic
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = 60.0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida: cliente HTTP compartido y generador de código"""
+    logger.info("Iniciando AI Services...")
+    
+    # Un único cliente para todas las llamadas a proveedores: evita un handshake TCP/TLS por request
+    app.state.http = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    # Generador propio de este ciclo de vida, ligado al cliente HTTP de arriba (no el singleton
+    # de módulo: tras un reinicio en el mismo proceso seguiría usando un cliente ya cerrado)
+    generator = CodeGenerator(app.state.http)
+    await generator.initialize_clients()
+    app.state.generator = generator
+    logger.info("AI Services iniciado correctamente")
+    
+    yield
+    
+    logger.info("Cerrando AI Services...")
+    await app.state.http.aclose()
+
+
 # Crear aplicación FastAPI
 app = FastAPI(
     title="TauseStack AI Services",
     description="Microservicio de integración con IA para generación de código y asistencia",
     version="0.9.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url="/docs" if _DOCS_ENABLED else None,
+    redoc_url="/redoc" if _DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if _DOCS_ENABLED else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -172,9 +205,9 @@ class ChatResponse(BaseModel):
 
 # === Dependencias ===
 
-async def get_generator() -> CodeGenerator:
-    """Dependencia para obtener el generador de código"""
-    return await get_code_generator()
+async def get_generator(request: Request) -> CodeGenerator:
+    """Dependencia para obtener el generador de código (inicializado en el startup)"""
+    return request.app.state.generator
 
 
 # === Endpoints Principales ===
@@ -535,14 +568,14 @@ async def generate_component_stream(
             code_chunks = [result.code[i:i+50] for i in range(0, len(result.code), 50)]
             
             for chunk in code_chunks:
-                yield f"data: {json.dumps({'chunk': chunk, 'type': 'code'})}\n\n"
+                yield f"data: {orjson.dumps({'chunk': chunk, 'type': 'code'}).decode()}\n\n"
                 await asyncio.sleep(0.1)  # Simular delay
             
             # Enviar metadata final
-            yield f"data: {json.dumps({'type': 'complete', 'metadata': {'provider': result.provider, 'tokens': result.tokens_used}})}\n\n"
+            yield f"data: {orjson.dumps({'type': 'complete', 'metadata': {'provider': result.provider, 'tokens': result.tokens_used}}).decode()}\n\n"
             
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield f"data: {orjson.dumps({'type': 'error', 'error': str(e)}).decode()}\n\n"
     
     return StreamingResponse(
         generate_stream(),
@@ -554,24 +587,6 @@ async def generate_component_stream(
     )
 
 
-# === Configuración de startup ===
-
-@app.on_event("startup")
-async def startup_event():
-    """Evento de inicio de la aplicación"""
-    logger.info("Iniciando AI Services...")
-    
-    # Inicializar generador de código
-    generator = await get_code_generator()
-    logger.info("AI Services iniciado correctamente")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Evento de cierre de la aplicación"""
-    logger.info("Cerrando AI Services...")
-
-
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8005, reload=True)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8005, reload=True, access_log=False)
\ No newline at end of file
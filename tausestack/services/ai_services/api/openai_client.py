@@ -8,6 +8,8 @@ import json
 import logging
 from dataclasses import dataclass
 
+import httpx
+
 try:
     import openai
     from openai import AsyncOpenAI
@@ -35,7 +37,7 @@ class OpenAIResponse:
 class OpenAIClient:
     """Cliente para integración con OpenAI GPT-4"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         if not openai:
             raise ImportError("openai package not installed. Run: pip install openai")
         
@@ -43,7 +45,8 @@ class OpenAIClient:
         if not self.api_key:
             raise ValueError("OpenAI API key not provided")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # http_client compartido por la app: reutiliza conexiones al proveedor entre requests
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=http_client)
         self.model_costs = {
             "gpt-4": {"input": 0.03, "output": 0.06},  # per 1K tokens
             "gpt-4-turbo": {"input": 0.01, "output": 0.03},
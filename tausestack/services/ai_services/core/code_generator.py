@@ -9,6 +9,8 @@ import json
 import logging
 import time
 
+import httpx
+
 from .prompt_engine import PromptEngine, PromptType, AIProvider, PromptTemplate
 from ..api.openai_client import OpenAIClient, OpenAIResponse, get_openai_client
 from ..api.claude_client import ClaudeClient, ClaudeResponse, get_claude_client
@@ -59,8 +61,11 @@ class GenerationResult:
 class CodeGenerator:
     """Generador de código con múltiples proveedores de IA"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.prompt_engine = PromptEngine()
+        # Cliente HTTP inyectado por la app: con él se crean clientes de proveedor propios
+        # (no los singletons de módulo, que sobrevivirían al cierre del cliente)
+        self.http_client = http_client
         self.openai_client: Optional[OpenAIClient] = None
         self.claude_client: Optional[ClaudeClient] = None
         self.provider_preferences = {
@@ -82,7 +87,9 @@ class CodeGenerator:
     async def initialize_clients(self):
         """Inicializa los clientes de IA"""
         try:
-            self.openai_client = get_openai_client()
+            self.openai_client = (
+                OpenAIClient(http_client=self.http_client) if self.http_client else get_openai_client()
+            )
             if await self.openai_client.validate_api_key():
                 logger.info("OpenAI client initialized successfully")
             else:
@@ -93,7 +100,9 @@ class CodeGenerator:
             self.openai_client = None
         
         try:
-            self.claude_client = get_claude_client()
+            self.claude_client = (
+                ClaudeClient(http_client=self.http_client) if self.http_client else get_claude_client()
+            )
             if await self.claude_client.validate_api_key():
                 logger.info("Claude client initialized successfully")
             else:
@@ -0,0 +1,125 @@
+"""
+Tests del Admin API: CRUD de configuraciones y persistencia en disco.
+"""
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from tausestack.services import admin_api
+from tausestack.services.admin_api import AdminAPIService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return AdminAPIService()
+
+
+@pytest.fixture
+def client(service):
+    with TestClient(service.app) as client:
+        yield client
+
+
+def test_list_default_apis(client):
+    resp = client.get("/admin/apis")
+    assert resp.status_code == 200
+    ids = {api["id"] for api in resp.json()}
+    assert ids == {"openai", "claude"}
+
+
+def test_create_and_get_api(client):
+    data = {"name": "Wompi Sandbox", "type": "payment", "description": "Pagos"}
+    resp = client.post("/admin/apis", json=data)
+    assert resp.status_code == 200
+    created = resp.json()
+    assert created["id"] == "wompi-sandbox"
+    assert created["status"] == "inactive"
+
+    resp = client.get("/admin/apis/wompi-sandbox")
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Wompi Sandbox"
+
+
+def test_update_api(client):
+    resp = client.put("/admin/apis/openai", json={"config_data": {"model": "gpt-4o"}})
+    assert resp.status_code == 200
+    assert resp.json()["config_data"]["model"] == "gpt-4o"
+
+
+def test_delete_default_api_forbidden(client):
+    resp = client.delete("/admin/apis/openai")
+    assert resp.status_code == 400
+
+
+def test_api_not_found(client):
+    assert client.get("/admin/apis/no-existe").status_code == 404
+    assert client.delete("/admin/apis/no-existe").status_code == 404
+
+
+def test_test_connection_without_key_marks_error(client):
+    resp = client.post("/admin/apis/openai/test")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "error"
+
+    history = client.get("/admin/apis/openai/health").json()
+    assert len(history) == 1
+    assert history[0]["api_id"] == "openai"
+
+
+def test_configs_persist_across_restarts(service, tmp_path):
+    with TestClient(service.app) as client:
+        client.post("/admin/apis", json={"name": "Saleor", "type": "external", "description": "Tienda"})
+
+    restarted = AdminAPIService()
+    with TestClient(restarted.app) as client:
+        ids = {api["id"] for api in client.get("/admin/apis").json()}
+    assert ids == {"openai", "claude", "saleor"}
+
+
+def test_repeated_connection_test_uses_probe_cache(client, service):
+    first = client.post("/admin/apis/claude/test").json()
+    second = client.post("/admin/apis/claude/test").json()
+
+    assert "claude" in service._probe_cache
+    history = client.get("/admin/apis/claude/health").json()
+    assert len(history) == 1
+    # La respuesta cacheada es el check registrado, no uno nuevo
+    assert second["timestamp"] == first["timestamp"] == history[0]["timestamp"]
+
+
+def test_health_check_all_covers_every_api(client):
+    resp = client.post("/admin/health-check-all")
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert {r["api_id"] for r in results} == {"openai", "claude"}
+    assert all(r["status"] == "error" for r in results)
+
+
+def test_update_invalidates_probe_cache(client, service):
+    client.post("/admin/apis/claude/test")
+    assert "claude" in service._probe_cache
+
+    client.put("/admin/apis/claude", json={"api_key": "sk-ant-nueva"})
+    assert "claude" not in service._probe_cache
+
+
+@pytest.mark.asyncio
+async def test_test_connection_without_startup_creates_client(service, monkeypatch):
+    # Uso directo, sin eventos de FastAPI: el probe debe crear su cliente HTTP
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        admin_api.httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=transport, **kwargs)
+    )
+    await service._load_configurations()
+    service.api_configs["openai"].api_key = "sk-test"
+    assert service.http_client is None
+
+    result = await service._test_connection("openai")
+
+    assert result.status == "active"
+    assert result.error_message is None
+    assert service.http_client is not None
+    await service._shutdown()
@@ -0,0 +1,160 @@
+"""
+Tests del Agent API: listado de agentes, persistencia del historial y validación de cuerpos.
+"""
+import asyncio
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from tausestack.services.agent_api import AgentAPIService, TaskExecutionResponse
+from tausestack.services.agent_engine.core.agent_config import AgentConfig
+from tausestack.services.agent_engine.core.agent_role import PresetRoles
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return AgentAPIService()
+
+
+@pytest.fixture
+def client(service):
+    with TestClient(service.app) as client:
+        yield client
+
+
+def _task(task_id):
+    return TaskExecutionResponse(
+        task_id=task_id,
+        agent_id="agent-1",
+        status="completed",
+        created_at=datetime(2024, 1, 1, 12, 0),
+        completed_at=datetime(2024, 1, 1, 12, 0, 1)
+    )
+
+
+def _create_agent(client, name):
+    resp = client.post("/agents", json={"name": name, "tenant_id": "t1", "role_type": "research"})
+    assert resp.status_code == 200
+    return resp.json()["agent_id"]
+
+
+def test_list_agents_skips_agent_whose_status_fails(client, service):
+    healthy = _create_agent(client, "Healthy Bot")
+    broken = _create_agent(client, "Broken Bot")
+
+    async def failing_status():
+        raise OSError("memoria no disponible")
+
+    service.active_agents[broken].get_status = failing_status
+
+    resp = client.get("/agents")
+    assert resp.status_code == 200
+    assert [agent["agent_id"] for agent in resp.json()] == [healthy]
+
+
+def test_legacy_task_history_is_migrated_to_jsonl(service):
+    legacy = [orjson.loads(orjson.dumps(_task(f"task-{i}"))) for i in range(3)]
+    service.legacy_tasks_file.write_bytes(orjson.dumps(legacy))
+
+    with TestClient(service.app) as client:
+        tasks = client.get("/tasks").json()
+        assert {task["task_id"] for task in tasks} == {"task-0", "task-1", "task-2"}
+
+    lines = service.tasks_file.read_bytes().splitlines()
+    assert [orjson.loads(line)["task_id"] for line in lines] == ["task-0", "task-1", "task-2"]
+
+    restarted = AgentAPIService()
+    with TestClient(restarted.app) as client:
+        assert client.get("/tasks/task-1").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_task_history_rotation_keeps_last_500(service):
+    for i in range(1100):
+        service._record_completed_task(_task(f"task-{i}"))
+        if i % 50 == 0:
+            await service._save_task_history()
+    await service._save_task_history()
+
+    # El archivo rota antes de superar las 1000 líneas
+    lines = service.tasks_file.read_bytes().splitlines()
+    assert len(lines) <= 1000
+    assert len(service.task_history) == 500
+    assert service.task_history[0].task_id == "task-600"
+    assert "task-599" not in service.task_history_by_id
+
+    restarted = AgentAPIService()
+    await restarted._load_agents()
+    assert len(restarted.task_history) == 500
+    assert restarted.task_history[0].task_id == "task-600"
+    assert restarted.task_history[-1].task_id == "task-1099"
+
+
+@pytest.mark.asyncio
+async def test_coalesced_agent_saves_return_after_their_write(service):
+    write_agents = service._write_agents
+    writes = []
+
+    async def slow_write():
+        await asyncio.sleep(0.01)
+        writes.append(len(service.active_agents))
+        await write_agents()
+
+    service._write_agents = slow_write
+
+    def saved_ids():
+        return {agent["agent_id"] for agent in orjson.loads(service.agents_file.read_bytes())}
+
+    async def add_and_save(i):
+        agent_id = f"agent-{i}"
+        config = AgentConfig(agent_id=agent_id, tenant_id="t1", name=agent_id, role=PresetRoles.research_agent())
+        service.active_agents[agent_id] = service.agent_manager.create_agent(config)
+        await service._save_agents()
+        # Al volver, el cambio de este llamador ya está en disco
+        assert agent_id in saved_ids()
+
+    await asyncio.gather(*(add_and_save(i) for i in range(5)))
+
+    assert len(writes) < 5
+    assert saved_ids() == {f"agent-{i}" for i in range(5)}
+    await service.agent_manager.aclose()
+
+
+def test_create_agent_valid_body(client):
+    resp = client.post("/agents", json={"name": "Valid Bot", "tenant_id": "t1", "role_type": "writer"})
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Valid Bot"
+    assert resp.json()["tenant_id"] == "t1"
+
+
+def test_create_agent_malformed_json_returns_422(client):
+    resp = client.post("/agents", content=b'{"name": ', headers={"content-type": "application/json"})
+    assert resp.status_code == 422
+    detail = resp.json()["detail"]
+    assert detail[0]["type"] == "json_invalid"
+    assert detail[0]["loc"][0] == "body"
+
+
+def test_create_agent_missing_field_returns_422(client):
+    resp = client.post("/agents", json={"name": "Sin Tenant", "role_type": "research"})
+    assert resp.status_code == 422
+    assert [error["loc"] for error in resp.json()["detail"]] == [["body", "tenant_id"]]
+
+
+def test_execute_task_body_validation(client):
+    agent_id = _create_agent(client, "Exec Bot")
+
+    resp = client.post(f"/agents/{agent_id}/execute", json={"task": "Resumir el informe"})
+    assert resp.status_code == 200
+    assert resp.json()["agent_id"] == agent_id
+
+    resp = client.post(f"/agents/{agent_id}/execute", json={"context": {}})
+    assert resp.status_code == 422
+    assert [error["loc"] for error in resp.json()["detail"]] == [["body", "task"]]
+
+    resp = client.post(f"/agents/{agent_id}/execute", content=b"[", headers={"content-type": "application/json"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"][0] == "body"
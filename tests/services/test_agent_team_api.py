@@ -0,0 +1,44 @@
+"""
+Tests del Agent Team API: historial de ejecuciones.
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tausestack.services.agent_team_api import AgentTeamAPIService, TeamExecutionResponse
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service = AgentTeamAPIService()
+    for i in range(5):
+        service._add_to_history(TeamExecutionResponse(
+            execution_id=f"exec-{i}",
+            team_id="team-a" if i % 2 == 0 else "team-b",
+            workflow_name="research",
+            status="completed",
+            start_time=datetime.now()
+        ))
+    return service
+
+
+@pytest.fixture
+def client(service):
+    with TestClient(service.app) as client:
+        yield client
+
+
+def _ids(resp):
+    return [execution["execution_id"] for execution in resp.json()]
+
+
+def test_list_executions_returns_latest(client):
+    assert _ids(client.get("/executions?limit=2")) == ["exec-3", "exec-4"]
+    assert _ids(client.get("/executions?limit=1&team_id=team-a")) == ["exec-4"]
+
+
+def test_list_executions_limit_zero_returns_all(client):
+    assert _ids(client.get("/executions?limit=0")) == [f"exec-{i}" for i in range(5)]
+    assert _ids(client.get("/executions?limit=0&team_id=team-b")) == ["exec-1", "exec-3"]
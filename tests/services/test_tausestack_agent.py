@@ -0,0 +1,100 @@
+"""
+Tests de TauseStackAgent: concurrencia acotada por max_concurrent_tasks.
+"""
+import asyncio
+
+import pytest
+
+from tausestack.services.agent_engine.core.agent_config import AgentConfig
+from tausestack.services.agent_engine.core.agent_role import PresetRoles
+from tausestack.services.agent_engine.core.tausestack_agent import TauseStackAgent
+
+
+@pytest.fixture
+def make_agent(tmp_path):
+    def make(max_concurrent_tasks):
+        config = AgentConfig(
+            agent_id="agent-1",
+            tenant_id="t1",
+            name="Agent",
+            role=PresetRoles.research_agent(),
+            max_concurrent_tasks=max_concurrent_tasks
+        )
+        agent = TauseStackAgent(config, "http://localhost:9001", tmp_path)
+        agent.running = 0
+        agent.peak = 0
+        agent.release = asyncio.Event()
+
+        # Tarea simulada: se queda en curso hasta que el test la libera
+        async def run_task(task_id, task, context):
+            agent.running += 1
+            agent.peak = max(agent.peak, agent.running)
+            await agent.release.wait()
+            agent.running -= 1
+            return task_id
+
+        agent._run_task = run_task
+        return agent
+
+    return make
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_running_tasks_never_exceed_limit(make_agent):
+    agent = make_agent(max_concurrent_tasks=2)
+    tasks = [asyncio.create_task(agent.execute_task(f"task {i}")) for i in range(5)]
+    await _settle()
+
+    assert agent.running == 2
+
+    agent.release.set()
+    results = await asyncio.gather(*tasks)
+    assert len(set(results)) == 5
+    assert agent.peak == 2
+    await agent.aclose()
+
+
+@pytest.mark.asyncio
+async def test_raising_limit_admits_waiting_tasks(make_agent):
+    agent = make_agent(max_concurrent_tasks=1)
+    tasks = [asyncio.create_task(agent.execute_task(f"task {i}")) for i in range(3)]
+    await _settle()
+    assert agent.running == 1
+
+    await agent.update_config(max_concurrent_tasks=3)
+    await _settle()
+    assert agent.running == 3
+
+    agent.release.set()
+    await asyncio.gather(*tasks)
+    await agent.aclose()
+
+
+@pytest.mark.asyncio
+async def test_busy_state_tracks_inflight_tasks(make_agent):
+    agent = make_agent(max_concurrent_tasks=2)
+    assert not agent.is_busy
+
+    tasks = [asyncio.create_task(agent.execute_task(f"task {i}")) for i in range(2)]
+    await _settle()
+
+    status = await agent.get_status()
+    assert agent.is_busy
+    assert status["is_busy"] is True
+    assert sorted(status["inflight_task_ids"]) == sorted(agent._inflight)
+    assert len(status["inflight_task_ids"]) == 2
+
+    agent.release.set()
+    task_ids = await asyncio.gather(*tasks)
+
+    status = await agent.get_status()
+    assert not agent.is_busy
+    assert status["is_busy"] is False
+    assert status["inflight_task_ids"] == []
+    assert all(task_id not in status["inflight_task_ids"] for task_id in task_ids)
+    await agent.aclose()